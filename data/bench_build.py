@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Build Scaling Benchmark
+
+This script generates synthetic DDF repositories at increasing scales with
+synthetic_ddf.py and runs the full gapminder_to_duckdb.py conversion on each,
+to show where the build stops scaling.
+
+For every scale it records:
+- Size of the generated input
+- Build time of the conversion
+- Peak memory (maximum resident set size) of the conversion process
+- Size of the output database
+- With --fetches, the time to fetch one whole (indicator, geo) series from the
+  datapoint tables and, if built with --series-layout, from series_by_geo_time
+
+Each conversion runs in its own process, so peak memory is measured per build.
+Arguments not listed below are passed on to the converter.
+
+Usage:
+    python bench_build.py [--scales 0.1 1 10] [--scale-by indicators] [--output results.csv]
+    python bench_build.py --fetches 200 --series-layout
+"""
+
+import os
+import sys
+import argparse
+import csv
+import logging
+import random
+import shutil
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+import duckdb
+
+from synthetic_ddf import SyntheticDDFGenerator
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+CONVERTER = Path(__file__).resolve().parent / 'gapminder_to_duckdb.py'
+
+# Generator parameters at scale 1, roughly the size of a Gapminder dataset
+BASE_CONFIG = {
+    'concepts': 20,
+    'entities': 250,
+    'indicators': 500,
+    'files_per_group': 1,
+    'rows': 20000,
+}
+
+
+def run_build(repo_path: Path, output_db: Path, extra_args: List[str]) -> Dict:
+    """Run the converter in a child process and measure it."""
+    command = [
+        sys.executable, str(CONVERTER), '--offline', '--no-indexes', '--restart',
+        '--repo-path', str(repo_path), '--output-db', str(output_db)
+    ] + extra_args
+
+    start = time.perf_counter()
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    # Read stderr before waiting, the converter logs enough to fill the pipe
+    stderr = process.stderr.read()
+    _, status, usage = os.wait4(process.pid, 0)
+    build_seconds = time.perf_counter() - start
+    process.returncode = os.waitstatus_to_exitcode(status)
+
+    if process.returncode != 0:
+        logger.error(stderr.decode('utf-8', errors='replace')[-2000:])
+        raise RuntimeError(f"Conversion failed with exit code {process.returncode}")
+
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    peak_rss = usage.ru_maxrss * (1 if sys.platform == 'darwin' else 1024)
+    return {
+        'build_seconds': build_seconds,
+        'peak_memory_mb': peak_rss / (1024 * 1024),
+        'output_mb': output_db.stat().st_size / (1024 * 1024),
+    }
+
+
+def measure_fetches(output_db: Path, fetches: int) -> Dict:
+    """Time fetching whole series of random (indicator, geo) pairs in both layouts.
+
+    Returns the mean fetch time in milliseconds from the row-per-observation
+    datapoint tables and, if the database has it, from series_by_geo_time.
+    """
+    connection = duckdb.connect(str(output_db), read_only=True)
+    try:
+        keys = connection.execute("""
+            SELECT c.indicator, c.table_name, c.geo, t.dimensions
+            FROM metadata_coverage c
+            JOIN metadata_tables t USING (table_name)
+            WHERE len(t.dimensions) = 2
+        """).fetchall()
+        has_series = connection.execute("""
+            SELECT COUNT(*) FROM duckdb_tables() WHERE table_name = 'series_by_geo_time'
+        """).fetchone()[0] > 0
+        if not keys:
+            return {}
+
+        sample = random.Random(0).choices(keys, k=fetches)
+        row_seconds = 0.0
+        series_seconds = 0.0
+        for indicator, table_name, geo, dimensions in sample:
+            geo_column, time_column = dimensions if dimensions[0] != 'time' else dimensions[::-1]
+            start = time.perf_counter()
+            connection.execute(f"""
+                SELECT "{time_column}", "{indicator}" FROM {table_name}
+                WHERE "{geo_column}" = ? ORDER BY "{time_column}"
+            """, [geo]).fetchall()
+            row_seconds += time.perf_counter() - start
+
+            if has_series:
+                start = time.perf_counter()
+                connection.execute("""
+                    SELECT time, value FROM series_by_geo_time WHERE indicator = ? AND geo = ?
+                """, [indicator, geo]).fetchall()
+                series_seconds += time.perf_counter() - start
+    finally:
+        connection.close()
+
+    results = {'fetch_rows_ms': row_seconds * 1000 / fetches}
+    if has_series:
+        results['fetch_series_ms'] = series_seconds * 1000 / fetches
+    return results
+
+
+def run_benchmark(scales: List[float], scale_by: List[str], work_dir: Path,
+                  config: Dict, extra_args: List[str], keep: bool, fetches: int = 0) -> List[Dict]:
+    """Generate and convert a repository per scale, returning one result per scale."""
+    results = []
+
+    for scale in scales:
+        scaled_config = dict(config)
+        for parameter in scale_by:
+            scaled_config[parameter] = max(1, round(config[parameter] * scale))
+
+        repo_path = work_dir / f"ddf--synthetic--{scale:g}"
+        output_db = work_dir / f"synthetic-{scale:g}.duckdb"
+        shutil.rmtree(repo_path, ignore_errors=True)
+        # Include leftovers of an interrupted build, so every build starts from scratch
+        for stale_file in (output_db, output_db.with_name(output_db.name + '.partial'),
+                           output_db.with_name(output_db.name + '.partial.wal'),
+                           output_db.with_name(output_db.name + '.journal')):
+            stale_file.unlink(missing_ok=True)
+
+        logger.info(f"Scale {scale:g}: {scaled_config}")
+        stats = SyntheticDDFGenerator(str(repo_path), **scaled_config).generate()
+        measurements = run_build(repo_path, output_db, extra_args)
+        if fetches:
+            measurements.update(measure_fetches(output_db, fetches))
+
+        result = {'scale': scale, **stats, **measurements}
+        results.append(result)
+        logger.info(f"Scale {scale:g}: built {result['input_mb']:.1f} MB of CSV in "
+                    f"{result['build_seconds']:.1f} s, peak memory {result['peak_memory_mb']:.0f} MB, "
+                    f"output {result['output_mb']:.1f} MB")
+        if 'fetch_rows_ms' in result:
+            logger.info(f"Scale {scale:g}: series fetch {result['fetch_rows_ms']:.2f} ms from datapoint tables"
+                        + (f", {result['fetch_series_ms']:.2f} ms packed" if 'fetch_series_ms' in result else ""))
+
+        if not keep:
+            shutil.rmtree(repo_path, ignore_errors=True)
+            output_db.unlink()
+
+    return results
+
+
+def print_results(results: List[Dict]) -> None:
+    """Print results as a table, with throughput to compare scales."""
+    print(f"{'scale':>8} {'indicators':>10} {'rows':>12} {'input MB':>9} {'build s':>8} "
+          f"{'rows/s':>10} {'peak MB':>8} {'output MB':>9} {'fetch ms':>9} {'packed ms':>9}")
+    for result in results:
+        rows_per_second = result['rows'] / result['build_seconds']
+        fetch_ms = {key: f"{result[key]:.2f}" if key in result else '-'
+                    for key in ('fetch_rows_ms', 'fetch_series_ms')}
+        print(f"{result['scale']:>8g} {result['indicators']:>10} {result['rows']:>12,} "
+              f"{result['input_mb']:>9.1f} {result['build_seconds']:>8.1f} {rows_per_second:>10,.0f} "
+              f"{result['peak_memory_mb']:>8.0f} {result['output_mb']:>9.1f} "
+              f"{fetch_ms['fetch_rows_ms']:>9} {fetch_ms['fetch_series_ms']:>9}")
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark gapminder_to_duckdb.py on synthetic DDF repositories of increasing size",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python bench_build.py --scales 0.1 1 10
+  python bench_build.py --scales 1 10 100 --scale-by rows --output rows.csv
+  python bench_build.py --scales 1 4 16 --scale-by files_per_group
+  python bench_build.py --scales 1 10 --fetches 200 --series-layout
+        """
+    )
+
+    parser.add_argument(
+        '--scales',
+        type=float,
+        nargs='+',
+        default=[0.1, 1, 10],
+        help='Scale factors relative to a Gapminder-sized dataset (default: 0.1 1 10)'
+    )
+
+    parser.add_argument(
+        '--scale-by',
+        nargs='+',
+        choices=sorted(BASE_CONFIG),
+        default=['indicators'],
+        help='Generator parameters multiplied by the scale (default: indicators)'
+    )
+
+    for parameter, default in BASE_CONFIG.items():
+        parser.add_argument(
+            f"--{parameter.replace('_', '-')}",
+            type=int,
+            default=default,
+            help=f"Generator parameter at scale 1 (default: {default})"
+        )
+
+    parser.add_argument(
+        '--work-dir',
+        help='Directory for generated repositories and databases (default: a temporary directory)'
+    )
+
+    parser.add_argument(
+        '--keep',
+        action='store_true',
+        help='Keep generated repositories and databases'
+    )
+
+    parser.add_argument(
+        '--fetches',
+        type=int,
+        default=0,
+        help='Time this many random whole-series fetches per scale (default: 0)'
+    )
+
+    parser.add_argument(
+        '--output',
+        help='Write results to this CSV file'
+    )
+
+    args, extra_args = parser.parse_known_args()
+    config = {parameter: getattr(args, parameter) for parameter in BASE_CONFIG}
+
+    if args.work_dir:
+        work_dir = Path(args.work_dir)
+        work_dir.mkdir(parents=True, exist_ok=True)
+    else:
+        work_dir = Path(tempfile.mkdtemp(prefix='worldspecs-bench-'))
+
+    try:
+        results = run_benchmark(args.scales, args.scale_by, work_dir, config, extra_args, args.keep,
+                                args.fetches)
+    except RuntimeError as e:
+        logger.error(f"Benchmark failed: {e}")
+        sys.exit(1)
+    finally:
+        if not args.work_dir and not args.keep:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    print_results(results)
+
+    if args.output:
+        with open(args.output, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=list(results[0]))
+            writer.writeheader()
+            writer.writerows(results)
+        logger.info(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+"""
+DDF Naming Helpers
+
+Naming rules shared by the converter (gapminder_to_duckdb.py) and the read API
+(worldspecs.py), kept free of heavy imports so either can use them.
+"""
+
+import re
+
+
+def sanitize_name(name: str) -> str:
+    """Sanitize a name for use in table names."""
+    # Replace problematic characters with underscores
+    sanitized = re.sub(r'[^a-zA-Z0-9_]', '_', name)
+    # replace double-underscore with single underscore
+    sanitized = re.sub(r'_+', '_', sanitized)
+    # Ensure it doesn't start with a number
+    if sanitized and sanitized[0].isdigit():
+        sanitized = f"t_{sanitized}"
+    return sanitized
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+WorldSpecs Database Diff
+
+This script compares a newly built database with a previous release, e.g.
+before replacing static/worldspecs.duckdb, and reports what changed.
+
+Both databases are attached read-only to one DuckDB instance. For every table
+and view it compares:
+- The schema (table or view, column names and types)
+- The row count
+- An order-independent content hash: the sum of all row hashes, over the
+  columns both versions have
+
+Tables are compared in parallel, one cursor per worker thread. For changed
+tables a few sample rows only in the old or only in the new version are shown.
+
+The exit status is 0 if the databases have the same content and 1 if they
+differ, like diff(1).
+
+Usage:
+    python diff_db.py OLD_DB NEW_DB [--jobs N] [--samples N] [--json report.json]
+"""
+
+import os
+import sys
+import argparse
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import duckdb
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Name -> ('table' or 'view', [(column, type)])
+Schema = Dict[str, Tuple[str, List[Tuple[str, str]]]]
+
+
+class DatabaseDiff:
+    """Compares the tables and views of two DuckDB databases."""
+
+    def __init__(self, old_db: str, new_db: str, jobs: Optional[int] = None, samples: int = 5):
+        self.old_db = old_db
+        self.new_db = new_db
+        self.jobs = jobs or os.cpu_count() or 4
+        self.samples = samples
+
+        self.connection = duckdb.connect()
+        self.connection.execute(f"ATTACH '{self._escape(old_db)}' AS old_db (READ_ONLY)")
+        self.connection.execute(f"ATTACH '{self._escape(new_db)}' AS new_db (READ_ONLY)")
+        self._local = threading.local()
+
+    def compare(self) -> Dict:
+        """Compare both databases and return a report."""
+        old_schema = self._load_schema('old_db')
+        new_schema = self._load_schema('new_db')
+
+        added = sorted(set(new_schema) - set(old_schema))
+        removed = sorted(set(old_schema) - set(new_schema))
+        common = sorted(set(old_schema) & set(new_schema))
+        logger.info(f"Comparing {len(common)} tables and views with {self.jobs} workers "
+                    f"({len(added)} added, {len(removed)} removed)")
+
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            results = list(executor.map(
+                lambda table: self._compare_table(table, *old_schema[table], *new_schema[table]),
+                common
+            ))
+
+        changed = [result for result in results if result['changes']]
+        return {
+            'old_db': self.old_db,
+            'new_db': self.new_db,
+            'tables_compared': len(common),
+            'added': [{'table': table, 'type': new_schema[table][0], 'row_count': self._row_count('new_db', table)}
+                      for table in added],
+            'removed': [{'table': table, 'type': old_schema[table][0], 'row_count': self._row_count('old_db', table)}
+                        for table in removed],
+            'changed': changed,
+        }
+
+    def _cursor(self) -> duckdb.DuckDBPyConnection:
+        """Return the cursor of the current worker thread."""
+        if not hasattr(self._local, 'cursor'):
+            self._local.cursor = self.connection.cursor()
+        return self._local.cursor
+
+    def _load_schema(self, database: str) -> Schema:
+        """Return the kind, columns and types of every table and view in a database."""
+        rows = self.connection.execute("""
+            WITH objects AS (
+                SELECT table_name AS name, 'table' AS kind FROM duckdb_tables()
+                WHERE database_name = $database AND schema_name = 'main'
+                UNION ALL
+                SELECT view_name, 'view' FROM duckdb_views()
+                WHERE database_name = $database AND schema_name = 'main' AND NOT internal
+            )
+            SELECT o.name, o.kind, list((c.column_name, c.data_type) ORDER BY c.column_index)
+            FROM objects o
+            JOIN duckdb_columns() c
+              ON c.database_name = $database AND c.schema_name = 'main' AND c.table_name = o.name
+            GROUP BY o.name, o.kind
+        """, {'database': database}).fetchall()
+        return {name: (kind, [tuple(column) for column in columns]) for name, kind, columns in rows}
+
+    def _row_count(self, database: str, table: str) -> Optional[int]:
+        try:
+            return self.connection.execute(f'SELECT COUNT(*) FROM {database}.main."{table}"').fetchone()[0]
+        except duckdb.Error as e:
+            # Views may no longer bind, e.g. over tables that were removed
+            logger.warning(f"Could not count rows of {database}.{table}: {e}")
+            return None
+
+    def _compare_table(self, table: str, old_kind: str, old_columns: List[Tuple[str, str]],
+                       new_kind: str, new_columns: List[Tuple[str, str]]) -> Dict:
+        """Compare one table or view present in both databases."""
+        result = {'table': table, 'changes': []}
+        try:
+            old_types = dict(old_columns)
+            new_types = dict(new_columns)
+            if old_kind != new_kind:
+                result['changes'].append('schema')
+                result['type_changed'] = f"{old_kind} -> {new_kind}"
+            if old_columns != new_columns:
+                if 'schema' not in result['changes']:
+                    result['changes'].append('schema')
+                result['columns_added'] = [name for name in new_types if name not in old_types]
+                result['columns_removed'] = [name for name in old_types if name not in new_types]
+                result['columns_retyped'] = [
+                    f"{name}: {old_types[name]} -> {new_types[name]}"
+                    for name in old_types if name in new_types and old_types[name] != new_types[name]
+                ]
+
+            # Content is compared on the columns both versions have, in the old order
+            columns = [name for name in old_types if name in new_types]
+            old_count, old_hash = self._fingerprint('old_db', table, columns)
+            new_count, new_hash = self._fingerprint('new_db', table, columns)
+            result['old_rows'] = old_count
+            result['new_rows'] = new_count
+
+            if old_count != new_count:
+                result['changes'].append('row_count')
+            if old_hash != new_hash:
+                result['changes'].append('content')
+                result['only_in_old'] = self._sample_rows('old_db', 'new_db', table, columns)
+                result['only_in_new'] = self._sample_rows('new_db', 'old_db', table, columns)
+        except duckdb.Error as e:
+            logger.error(f"Error comparing table {table}: {e}")
+            result['changes'].append('error')
+            result['error'] = str(e)
+
+        return result
+
+    def _fingerprint(self, database: str, table: str, columns: List[str]) -> Tuple[int, Optional[int]]:
+        """Return the row count and the order-independent content hash of a table."""
+        if not columns:
+            return self._cursor().execute(
+                f'SELECT COUNT(*), NULL FROM {database}.main."{table}"'
+            ).fetchone()
+
+        row = ", ".join(f'"{column}"' for column in columns)
+        return self._cursor().execute(f"""
+            SELECT COUNT(*), SUM(hash(row({row})))
+            FROM {database}.main."{table}"
+        """).fetchone()
+
+    def _sample_rows(self, database: str, other: str, table: str, columns: List[str]) -> List[List]:
+        """Return rows of a table that the other database does not have."""
+        if not columns or not self.samples:
+            return []
+
+        select_list = ", ".join(f'"{column}"' for column in columns)
+        rows = self._cursor().execute(f"""
+            SELECT {select_list} FROM {database}.main."{table}"
+            EXCEPT ALL
+            SELECT {select_list} FROM {other}.main."{table}"
+            LIMIT {int(self.samples)}
+        """).fetchall()
+        # JSON-friendly values for the report
+        return [[value if isinstance(value, (int, float, str, bool, type(None))) else str(value)
+                 for value in row] for row in rows]
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self.connection.close()
+
+    @staticmethod
+    def _escape(path: str) -> str:
+        return path.replace("'", "''")
+
+
+def print_report(report: Dict) -> None:
+    """Print a summary of the differences."""
+    print(f"Compared {report['old_db']} -> {report['new_db']}")
+    print(f"  Tables and views compared: {report['tables_compared']}")
+    print(f"  Added: {len(report['added'])}, removed: {len(report['removed'])}, "
+          f"changed: {len(report['changed'])}")
+
+    if report['added']:
+        print("\nAdded tables and views:")
+        for table in report['added']:
+            print(f"  + {table['table']} ({_describe_size(table)})")
+
+    if report['removed']:
+        print("\nRemoved tables and views:")
+        for table in report['removed']:
+            print(f"  - {table['table']} ({_describe_size(table)})")
+
+    if report['changed']:
+        print("\nChanged tables and views:")
+        for table in report['changed']:
+            print(f"  ~ {table['table']}: {', '.join(table['changes'])}")
+            if 'error' in table:
+                print(f"      error: {table['error']}")
+                continue
+            if 'type_changed' in table:
+                print(f"      type: {table['type_changed']}")
+            if table['old_rows'] != table['new_rows']:
+                print(f"      rows: {table['old_rows']:,} -> {table['new_rows']:,}")
+            for key, label in (('columns_added', '+ column'), ('columns_removed', '- column'),
+                               ('columns_retyped', '~ column')):
+                for column in table.get(key, []):
+                    print(f"      {label} {column}")
+            for row in table.get('only_in_old', []):
+                print(f"      - {tuple(row)}")
+            for row in table.get('only_in_new', []):
+                print(f"      + {tuple(row)}")
+
+
+def _describe_size(table: Dict) -> str:
+    rows = 'unknown rows' if table['row_count'] is None else f"{table['row_count']:,} rows"
+    return f"{table['type']}, {rows}"
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Compare a new WorldSpecs database with a previous release",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python diff_db.py ../static/worldspecs.duckdb gapminder.duckdb
+  python diff_db.py old.duckdb new.duckdb --jobs 16 --samples 10 --json diff.json
+        """
+    )
+
+    parser.add_argument('old_db', help='Previous database')
+    parser.add_argument('new_db', help='New database')
+    parser.add_argument('--jobs', type=int, help='Number of tables compared in parallel (default: CPU count)')
+    parser.add_argument('--samples', type=int, default=5,
+                        help='Sample differing rows shown per changed table and side (default: 5)')
+    parser.add_argument('--json', help='Also write the full report to this JSON file')
+
+    args = parser.parse_args()
+
+    for path in (args.old_db, args.new_db):
+        if not Path(path).exists():
+            logger.error(f"Database file not found: {path}")
+            sys.exit(2)
+
+    diff = DatabaseDiff(args.old_db, args.new_db, jobs=args.jobs, samples=args.samples)
+    try:
+        report = diff.compare()
+    finally:
+        diff.close()
+
+    print_report(report)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, default=str)
+        logger.info(f"Report written to {args.json}")
+
+    sys.exit(1 if report['added'] or report['removed'] or report['changed'] else 0)
+
+
+if __name__ == "__main__":
+    main()
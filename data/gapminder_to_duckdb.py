@@ -18,14 +18,19 @@ Usage:
 import os
 import sys
 import argparse
+import csv
+import hashlib
+import json
 import logging
 import re
 import subprocess
-from pathlib import Path
+from pathlib import Path, PurePosixPath
 from typing import Dict, List, Set, Optional, Tuple
 import pandas as pd
 import duckdb
 
+from ddf_names import sanitize_name
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -34,22 +39,143 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+class BuildJournal:
+    """Append-only record of the phases and tables a build has completed.
+
+    The first line holds a fingerprint of the build inputs, every further line
+    one completed step, or a step to redo because its inputs changed. A journal
+    only applies to a build with the same fingerprint, so a changed source or
+    converter starts over.
+    """
+
+    def __init__(self, path: Path, fingerprint: Dict):
+        self.path = path
+        self.fingerprint = fingerprint
+        self.completed: Set[str] = set()
+        self.file = None
+
+    def load(self) -> bool:
+        """Load completed steps from an existing journal with a matching fingerprint."""
+        if not self.path.exists():
+            return False
+
+        with open(self.path, encoding='utf-8') as f:
+            lines = f.read().splitlines()
+
+        try:
+            if not lines or json.loads(lines[0]).get('fingerprint') != self.fingerprint:
+                return False
+        except ValueError:
+            return False
+
+        for line in lines[1:]:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # A line cut off by an interrupted write, the step is simply redone
+                continue
+            if 'done' in entry:
+                self.completed.add(entry['done'])
+            elif 'undone' in entry:
+                self.completed.discard(entry['undone'])
+        return True
+
+    def open(self, append: bool) -> None:
+        """Open the journal, appending to the loaded one or starting a new one."""
+        if append:
+            self.file = open(self.path, 'a', encoding='utf-8')
+        else:
+            self.completed.clear()
+            self.file = open(self.path, 'w', encoding='utf-8')
+            self._append({'fingerprint': self.fingerprint})
+
+    def is_done(self, step: str) -> bool:
+        return step in self.completed
+
+    def mark_done(self, step: str) -> None:
+        """Record a step as completed. Call only after its results are committed."""
+        self.completed.add(step)
+        self._append({'done': step})
+
+    def forget(self, steps) -> None:
+        """Record completed steps as to be redone, e.g. because their inputs changed."""
+        for step in steps:
+            if step in self.completed:
+                self.completed.discard(step)
+                self._append({'undone': step})
+
+    def _append(self, entry: Dict) -> None:
+        self.file.write(json.dumps(entry) + '\n')
+        self.file.flush()
+
+    def close(self) -> None:
+        if self.file:
+            self.file.close()
+            self.file = None
+
+    def remove(self) -> None:
+        """Close and delete the journal."""
+        self.close()
+        self.path.unlink(missing_ok=True)
+
+
 class GapminderToDuckDB:
     """Main class for converting Gapminder DDF data to DuckDB."""
 
-    def __init__(self, repo_path: str, output_db: str, source_repo: str,
-                 verbose: bool = False, create_indexes: bool = True):
+    # Column types for DDF concept types; other concepts are read as text
+    CONCEPT_COLUMN_TYPES = {
+        'measure': 'DOUBLE',
+        'boolean': 'BOOLEAN',
+        'time': 'SMALLINT',
+        'year': 'SMALLINT',
+    }
+
+    # Phases reading all entity and datapoint tables, redone when a run builds any table
+    DERIVED_STEPS = ('geo hierarchy', 'indicator statistics', 'series layout', 'metadata views', 'indexes')
+
+    TABLES_CATALOG_DESCRIPTION = (
+        'Catalog of all tables with their type, indicator, dimensions, columns, '
+        'row count, time range, number of geos and description'
+    )
+
+    # Quantiles and number of histogram bins stored per indicator and year
+    STATS_QUANTILES = [0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99]
+    STATS_HISTOGRAM_BINS = 20
+
+    # Column types for field types given in a datapackage.json schema
+    SCHEMA_COLUMN_TYPES = {
+        'number': 'DOUBLE',
+        'integer': 'BIGINT',
+        'boolean': 'BOOLEAN',
+        'year': 'SMALLINT',
+        'string': 'VARCHAR',
+    }
+
+    def __init__(self, repo_path: str, output_db: str, source_repo: Optional[str],
+                 verbose: bool = False, create_indexes: bool = True, resume: bool = True,
+                 series_layout: bool = False):
         self.repo_path = Path(repo_path)
         self.output_db = Path(output_db)
         self.source_repo = source_repo
         self.verbose = verbose
-        self.create_indexes = create_indexes
+        self.with_indexes = create_indexes
+        self.resume = resume
+        self.series_layout = series_layout
         self.connection = None
 
+        # The database is built next to the output and moved into place when complete
+        self.build_db = self.output_db.with_name(self.output_db.name + '.partial')
+        self.journal: Optional[BuildJournal] = None
+
         # Storage for metadata
         self.concepts: Dict[str, Dict] = {}
         self.entities: Dict[str, Dict] = {}
         self.datapoint_files: List[Path] = []
+        self.datapoint_info: Dict[Path, Tuple[str, List[str]]] = {}
+        self.schema_field_types: Dict[str, str] = {}
+        self.column_types: Dict[str, str] = {}
+        self.datapoint_tables: Dict[str, Tuple[str, List[str]]] = {}
+        self.tables_built = 0
 
         if verbose:
             logger.setLevel(logging.DEBUG)
@@ -58,7 +184,9 @@ class GapminderToDuckDB:
         """Clone the repository if it doesn't exist, or update if it does."""
         repo_url = self.source_repo
 
-        if not self.repo_path.exists():
+        if repo_url is None:
+            logger.info(f"No source repository given, using {self.repo_path} as is")
+        elif not self.repo_path.exists():
             logger.info(f"Cloning repository to {self.repo_path}")
             subprocess.run([
                 "git", "clone", "--depth", "1", repo_url, str(self.repo_path)
@@ -69,14 +197,84 @@ class GapminderToDuckDB:
                 "git", "-C", str(self.repo_path), "pull"
             ], check=True)
 
+    def open_journal(self) -> None:
+        """Open the build journal, resuming a previous build of the same inputs if possible."""
+        self.journal = BuildJournal(
+            self.output_db.with_name(self.output_db.name + '.journal'),
+            self._build_fingerprint()
+        )
+
+        resumed = self.resume and self.build_db.exists() and self.journal.load()
+        if resumed:
+            logger.info(f"Resuming previous build, {len(self.journal.completed)} steps already completed")
+        else:
+            # Start over, dropping any partial database of a different or unjournaled build
+            for stale_file in (self.build_db, self.build_db.with_name(self.build_db.name + '.wal')):
+                stale_file.unlink(missing_ok=True)
+
+        self.journal.open(append=resumed)
+
+    def _build_fingerprint(self) -> Dict:
+        """Identify the build inputs: source revision or content, converter version and options."""
+        try:
+            revision = subprocess.run(
+                ["git", "-C", str(self.repo_path), "rev-parse", "HEAD"],
+                capture_output=True, text=True, check=True
+            ).stdout.strip()
+            # Uncommitted or untracked files make the revision an incomplete description
+            dirty = subprocess.run(
+                ["git", "-C", str(self.repo_path), "status", "--porcelain", "--", "."],
+                capture_output=True, text=True, check=True
+            ).stdout.strip()
+        except (subprocess.CalledProcessError, FileNotFoundError):
+            revision, dirty = None, True
+
+        # The naming rules decide table names, so they count as part of the converter
+        converter = hashlib.sha256()
+        for module_file in (__file__, Path(__file__).with_name('ddf_names.py')):
+            with open(module_file, 'rb') as f:
+                converter.update(f.read())
+        converter_hash = converter.hexdigest()
+
+        return {
+            'source_revision': revision,
+            'source_content': self._content_signature() if dirty else None,
+            'repo_path': str(self.repo_path.resolve()),
+            'converter': converter_hash,
+            'create_indexes': self.with_indexes,
+            'series_layout': self.series_layout,
+        }
+
+    def _content_signature(self) -> str:
+        """Hash the index files and the size and modification time of every CSV file."""
+        signature = hashlib.sha256()
+        for index_file in ('datapackage.json', 'ddf--concepts.csv'):
+            path = self.repo_path / index_file
+            if path.exists():
+                signature.update(path.read_bytes())
+
+        for csv_file in sorted(self.repo_path.rglob('*.csv')):
+            stat = csv_file.stat()
+            relative_path = csv_file.relative_to(self.repo_path).as_posix()
+            signature.update(f"{relative_path}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode('utf-8'))
+        return signature.hexdigest()
+
+    def _run_step(self, step: str, function) -> None:
+        """Run a build phase unless the journal records it as completed."""
+        if self.journal.is_done(step):
+            logger.info(f"Skipping {step}, completed in a previous run")
+            return
+        function()
+        self.journal.mark_done(step)
+
     def connect_db(self) -> None:
-        """Create or connect to the DuckDB database."""
-        if self.output_db.exists():
-            logger.info(f"Connecting to existing database: {self.output_db}")
+        """Create or connect to the DuckDB database being built."""
+        if self.build_db.exists():
+            logger.info(f"Connecting to partial database: {self.build_db}")
         else:
-            logger.info(f"Creating new database: {self.output_db}")
+            logger.info(f"Creating new database: {self.build_db}")
 
-        self.connection = duckdb.connect(str(self.output_db))
+        self.connection = duckdb.connect(str(self.build_db))
 
         # Enable CSV auto-detection and configure for better performance
         self.connection.execute("SET enable_object_cache=true;")
@@ -115,37 +313,148 @@ class GapminderToDuckDB:
             logger.error(f"Error loading concepts: {e}")
 
     def discover_files(self) -> None:
-        """Discover all DDF CSV files in the repository."""
+        """Discover all DDF CSV files, using datapackage.json when available."""
         logger.info("Discovering DDF files...")
 
+        resources = self._load_datapackage_resources()
+        if resources is None:
+            self._discover_files_by_walk()
+        else:
+            for resource in resources:
+                self._register_resource(resource)
+
+        logger.info(f"Found {len(self.entities)} entity files")
+        logger.info(f"Found {len(self.datapoint_files)} datapoint files")
+
+    def _load_datapackage_resources(self) -> Optional[List[Dict]]:
+        """Load the resource list from datapackage.json, or None if unusable."""
+        datapackage_file = self.repo_path / "datapackage.json"
+
+        if not datapackage_file.exists():
+            logger.info("No datapackage.json found, walking the repository instead")
+            return None
+
+        try:
+            with open(datapackage_file, encoding='utf-8') as f:
+                resources = json.load(f).get('resources')
+        except (OSError, ValueError, AttributeError) as e:
+            logger.warning(f"Could not read {datapackage_file}, walking the repository instead: {e}")
+            return None
+
+        if not isinstance(resources, list):
+            logger.warning(f"No resources listed in {datapackage_file}, walking the repository instead")
+            return None
+
+        logger.debug(f"Found {len(resources)} resources in {datapackage_file}")
+        return resources
+
+    def _register_resource(self, resource: Dict) -> None:
+        """Classify a datapackage resource by its primary key and register it."""
+        path = resource.get('path', '')
+        if not path.endswith('.csv'):
+            return
+
+        # Skip non-English files
+        relative_path = PurePosixPath(path)
+        if relative_path.parts[0] == 'lang':
+            logger.debug(f"Ignoring resource {path} (contains 'lang/')")
+            return
+
+        csv_file = self.repo_path / relative_path
+        schema = resource.get('schema', {})
+        primary_key = schema.get('primaryKey', [])
+        if isinstance(primary_key, str):
+            primary_key = [primary_key]
+        fields = [field['name'] for field in schema.get('fields', [])]
+        for field in schema.get('fields', []):
+            if 'type' in field:
+                self.schema_field_types[field['name']] = field['type']
+
+        # Skip the concepts file (already handled separately)
+        if primary_key == ['concept']:
+            return
+
+        # Synonyms and translations are neither entities nor datapoints
+        if csv_file.name.startswith(('ddf--synonyms', 'ddf--translations')):
+            logger.debug(f"Ignoring resource {path} (synonyms or translations)")
+            return
+
+        if not primary_key:
+            logger.warning(f"Resource {path} has no primary key, classifying it by file name")
+            self._register_file_by_name(csv_file)
+            return
+
+        key_types = [self.concepts.get(key, {}).get('concept_type') for key in primary_key]
+        values = [field for field in fields if field not in primary_key]
+
+        if self._is_datapoint_resource(csv_file, primary_key, values):
+            self.datapoint_files.append(csv_file)
+            if len(values) == 1:
+                self.datapoint_info[csv_file] = (values[0], primary_key)
+        elif len(primary_key) == 1 and key_types[0] in ('entity_domain', 'entity_set'):
+            entity_type = self._extract_entity_type(csv_file.name) or primary_key[0]
+            self._register_entity(entity_type, csv_file, primary_key[0])
+        elif len(primary_key) == 1 and key_types[0] is None:
+            # Concepts unavailable, the key alone can't tell entities from datapoints
+            self._register_file_by_name(csv_file)
+        else:
+            logger.warning(f"Ignoring resource {path}: key {primary_key} is neither an entity nor datapoint key")
+
+    def _is_datapoint_resource(self, csv_file: Path, primary_key: List[str], values: List[str]) -> bool:
+        """Check whether a resource holds datapoints: a measure by dimension concepts."""
+        if csv_file.name.startswith('ddf--datapoints'):
+            return True
+        if csv_file.name.startswith('ddf--entities'):
+            return False
+        dimension_types = ('entity_domain', 'entity_set', 'time', 'year')
+        return (
+            all(self.concepts.get(key, {}).get('concept_type') in dimension_types for key in primary_key)
+            and len(values) == 1
+            and self.concepts.get(values[0], {}).get('concept_type') == 'measure'
+        )
+
+    def _register_entity(self, entity_type: str, csv_file: Path, key: Optional[str] = None) -> None:
+        """Register an entity file, keeping the first file of an entity type."""
+        if entity_type in self.entities:
+            logger.warning(f"Ignoring {csv_file}: entity type {entity_type} is already "
+                           f"registered from {self.entities[entity_type]['file']}")
+            return
+
+        self.entities[entity_type] = {
+            'file': csv_file,
+            'name': entity_type.replace('_', ' ').title()
+        }
+        if key:
+            self.entities[entity_type]['key'] = key
+
+    def _discover_files_by_walk(self) -> None:
+        """Discover DDF CSV files by walking the repository (fallback)."""
         # Find all CSV files that follow DDF naming convention
         for csv_file in self.repo_path.rglob("*.csv"):
-            filename = csv_file.name
-
             # Skip non-English files (look for language indicators)
             if csv_file.match('lang/**/*.csv'):
                 logger.debug(f"Ignoring file {csv_file} (contains 'lang/')")
                 continue
 
-            # Skip the concepts file (already handled separately)
-            if filename == "ddf--concepts.csv":
-                continue
+            self._register_file_by_name(csv_file)
 
-            # Categorize files
-            if filename.startswith("ddf--entities"):
-                # Entity files
-                entity_type = self._extract_entity_type(filename)
-                if entity_type:
-                    self.entities[entity_type] = {
-                        'file': csv_file,
-                        'name': entity_type.replace('_', ' ').title()
-                    }
-            elif filename.startswith("ddf--datapoints"):
-                # Datapoint files
-                self.datapoint_files.append(csv_file)
+    def _register_file_by_name(self, csv_file: Path) -> None:
+        """Categorize a DDF CSV file by its naming convention."""
+        filename = csv_file.name
 
-        logger.info(f"Found {len(self.entities)} entity files")
-        logger.info(f"Found {len(self.datapoint_files)} datapoint files")
+        # Skip the concepts file (already handled separately)
+        if filename == "ddf--concepts.csv":
+            return
+
+        # Categorize files
+        if filename.startswith("ddf--entities"):
+            # Entity files
+            entity_type = self._extract_entity_type(filename)
+            if entity_type:
+                self._register_entity(entity_type, csv_file)
+        elif filename.startswith("ddf--datapoints"):
+            # Datapoint files
+            self.datapoint_files.append(csv_file)
 
     def _extract_entity_type(self, filename: str) -> Optional[str]:
         """Extract entity type from filename."""
@@ -153,6 +462,12 @@ class GapminderToDuckDB:
         match = re.match(r'ddf--entities--(.+)\.csv', filename)
         return match.group(1) if match else None
 
+    def _datapoint_info(self, csv_file: Path) -> Tuple[str, List[str]]:
+        """Get indicator and dimensions of a datapoint file, preferring its schema."""
+        if csv_file in self.datapoint_info:
+            return self.datapoint_info[csv_file]
+        return self._extract_datapoint_info(csv_file.name)
+
     def _extract_datapoint_info(self, filename: str) -> Tuple[str, List[str]]:
         """Extract indicator and dimensions from datapoint filename."""
         # Pattern: ddf--datapoints--<indicator>--by--<dim1>--<dim2>--etc.csv
@@ -178,22 +493,19 @@ class GapminderToDuckDB:
 
         for entity_type, entity_info in self.entities.items():
             try:
-                table_name = self._sanitize_table_name(f"entities_{entity_type}")
+                table_name = sanitize_name(f"entities_{entity_type}")
                 csv_file = entity_info['file']
+                columns = self._read_csv_header(csv_file)
 
-                logger.debug(f"Processing entity file: {csv_file}")
+                if self.journal.is_done(table_name):
+                    logger.debug(f"Skipping entity table {table_name}, completed in a previous run")
+                    self._register_entity_table(entity_info, table_name, columns)
+                    continue
 
-                # Read a sample to understand structure
-                sample_df = pd.read_csv(csv_file, nrows=5, encoding='utf-8')
-
-                # Create table using DuckDB's CSV auto-detection
-                create_sql = f"""
-                CREATE OR REPLACE TABLE {table_name} AS
-                SELECT * FROM read_csv_auto('{csv_file}', header=true, sample_size=1000)
-                """
-                logger.debug(f"executing {create_sql}")
+                logger.debug(f"Processing entity file: {csv_file}")
 
-                self.connection.execute(create_sql)
+                # Create table with column types derived from the DDF schema
+                self._create_table_from_csv(table_name, [csv_file], columns, sample_size=1000)
 
                 # Add table comment
                 entity_description = entity_info.get('name', entity_type.replace('_', ' ').title())
@@ -206,7 +518,11 @@ class GapminderToDuckDB:
                 self.connection.execute(table_comment_sql)
 
                 # Add column comments
-                self._add_column_comments(table_name, sample_df.columns.tolist())
+                self._add_column_comments(table_name, columns)
+
+                self._register_entity_table(entity_info, table_name, columns)
+                self.journal.mark_done(table_name)
+                self.tables_built += 1
 
                 # Get row count for logging
                 count = self.connection.execute(f"SELECT COUNT(*) FROM {table_name}").fetchone()[0]
@@ -215,6 +531,12 @@ class GapminderToDuckDB:
             except Exception as e:
                 logger.error(f"Error creating entity table for {entity_type}: {e}")
 
+    def _register_entity_table(self, entity_info: Dict, table_name: str, columns: List[str]) -> None:
+        """Remember the table created for an entity file, for later phases."""
+        entity_info['table'] = table_name
+        entity_info['columns'] = columns
+        entity_info.setdefault('key', columns[0])
+
     def create_datapoint_tables(self) -> None:
         """Create tables for datapoints."""
         logger.info("Creating datapoint tables...")
@@ -223,7 +545,7 @@ class GapminderToDuckDB:
         datapoint_groups = {}
 
         for dp_file in self.datapoint_files:
-            indicator, dimensions = self._extract_datapoint_info(dp_file.name)
+            indicator, dimensions = self._datapoint_info(dp_file)
 
             # Create a key for grouping similar datapoints
             key = f"{indicator}_by_{'_'.join(dimensions)}" if dimensions else indicator
@@ -232,10 +554,24 @@ class GapminderToDuckDB:
                 datapoint_groups[key] = []
             datapoint_groups[key].append(dp_file)
 
+        # Coverage rows are added as each table is created, kept from previous runs when resuming
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS metadata_coverage (
+                indicator VARCHAR, table_name VARCHAR, geo VARCHAR,
+                first_time INTEGER, last_time INTEGER, observations BIGINT
+            )
+        """)
+
         # Create tables for each group
+        skipped = 0
         for group_key, files in datapoint_groups.items():
             try:
-                table_name = f"datapoints_{self._sanitize_table_name(group_key)}"
+                table_name = f"datapoints_{sanitize_name(group_key)}"
+
+                if self.journal.is_done(table_name):
+                    self.datapoint_tables[table_name] = self._datapoint_info(files[0])
+                    skipped += 1
+                    continue
 
                 if len(files) == 1:
                     # Single file
@@ -244,27 +580,70 @@ class GapminderToDuckDB:
                     # Multiple files - union them
                     self._create_union_datapoint_table(table_name, files)
 
+                self.datapoint_tables[table_name] = self._datapoint_info(files[0])
+                self._add_coverage(table_name)
+                self.journal.mark_done(table_name)
+                self.tables_built += 1
+
             except Exception as e:
                 logger.error(f"Error creating datapoint table for {group_key}: {e}")
 
-    def _create_single_datapoint_table(self, table_name: str, csv_file: Path) -> None:
-        """Create a table from a single datapoint CSV file."""
-        logger.debug(f"Creating single datapoint table: {table_name}")
+        if skipped:
+            logger.info(f"Skipped {skipped} datapoint tables completed in a previous run")
 
-        # Read sample to understand structure
-        sample_df = pd.read_csv(csv_file, nrows=5, encoding='utf-8')
+        self._sort_coverage()
 
-        # Create table
-        create_sql = f"""
-        CREATE OR REPLACE TABLE {table_name} AS
-        SELECT * FROM read_csv_auto('{csv_file}', header=true, sample_size=1000)
+    def _add_coverage(self, table_name: str) -> None:
+        """Record per geo which years of a datapoint table's indicator have values."""
+        indicator, dimensions = self.datapoint_tables[table_name]
+        geo_column = next((d for d in dimensions if self._is_geo_concept(d)), None)
+        if not geo_column:
+            return
+        time_column = next((d for d in dimensions if self._is_time_concept(d)), None)
+        first_time = f'TRY_CAST(MIN("{time_column}") AS INTEGER)' if time_column else "NULL"
+        last_time = f'TRY_CAST(MAX("{time_column}") AS INTEGER)' if time_column else "NULL"
+
+        self.connection.execute("DELETE FROM metadata_coverage WHERE table_name = ?", [table_name])
+        self.connection.execute(f"""
+            INSERT INTO metadata_coverage
+            SELECT '{indicator}', '{table_name}', "{geo_column}"::VARCHAR,
+                   {first_time}, {last_time}, COUNT(*)
+            FROM {table_name}
+            WHERE "{indicator}" IS NOT NULL
+            GROUP BY "{geo_column}"
+        """)
+
+    def _sort_coverage(self) -> None:
+        """Sort the coverage table by indicator and index it by geo.
+
+        Lookups for one indicator read a few row groups thanks to the sort
+        order, lookups for one geo use the index.
         """
+        self.connection.execute("""
+            CREATE OR REPLACE TABLE metadata_coverage AS
+            SELECT * FROM metadata_coverage
+            ORDER BY indicator, geo, table_name
+        """)
+        self.connection.execute("CREATE INDEX idx_metadata_coverage_geo ON metadata_coverage (geo)")
+        self.connection.execute("""
+            COMMENT ON TABLE metadata_coverage IS
+            'Data availability per indicator and geo: first and last year with a value and the number of observations. Sorted by indicator, indexed by geo.'
+        """)
+
+        count = self.connection.execute("SELECT COUNT(*) FROM metadata_coverage").fetchone()[0]
+        logger.info(f"Created coverage table 'metadata_coverage' with {count} rows")
 
-        self.connection.execute(create_sql)
+    def _create_single_datapoint_table(self, table_name: str, csv_file: Path) -> None:
+        """Create a table from a single datapoint CSV file."""
+        logger.debug(f"Creating single datapoint table: {table_name}")
+
+        # Create table with column types derived from the DDF schema
+        columns = self._read_csv_header(csv_file)
+        self._create_table_from_csv(table_name, [csv_file], columns, sample_size=1000)
 
         # Add comments
-        indicator, dimensions = self._extract_datapoint_info(csv_file.name)
-        self._add_datapoint_table_comments(table_name, indicator, dimensions, sample_df.columns.tolist())
+        indicator, dimensions = self._datapoint_info(csv_file)
+        self._add_datapoint_table_comments(table_name, indicator, dimensions, columns)
 
         # Log result
         count = self.connection.execute(f"SELECT COUNT(*) FROM {table_name}").fetchone()[0]
@@ -274,25 +653,67 @@ class GapminderToDuckDB:
         """Create a table by unioning multiple datapoint CSV files."""
         logger.debug(f"Creating union datapoint table: {table_name} from {len(csv_files)} files")
 
-        # Create UNION query
-        union_parts = []
-        for csv_file in csv_files:
-            union_parts.append(f"SELECT * FROM read_csv_auto('{csv_file}', header=true, sample_size=500)")
-
-        union_sql = " UNION ALL ".join(union_parts)
-        create_sql = f"CREATE OR REPLACE TABLE {table_name} AS ({union_sql})"
-
-        self.connection.execute(create_sql)
+        # Create UNION query, all parts share the column order of the first file
+        columns = self._read_csv_header(csv_files[0])
+        self._create_table_from_csv(table_name, csv_files, columns, sample_size=500)
 
         # Add comments using first file for indicator/dimensions info
-        sample_df = pd.read_csv(csv_files[0], nrows=5, encoding='utf-8')
-        indicator, dimensions = self._extract_datapoint_info(csv_files[0].name)
-        self._add_datapoint_table_comments(table_name, indicator, dimensions, sample_df.columns.tolist())
+        indicator, dimensions = self._datapoint_info(csv_files[0])
+        self._add_datapoint_table_comments(table_name, indicator, dimensions, columns)
 
         # Log result
         count = self.connection.execute(f"SELECT COUNT(*) FROM {table_name}").fetchone()[0]
         logger.info(f"Created union datapoint table '{table_name}' with {count} rows from {len(csv_files)} files")
 
+    def _create_table_from_csv(self, table_name: str, csv_files: List[Path],
+                               columns: List[str], sample_size: int) -> None:
+        """Create a table from CSV files with explicit column types.
+
+        Falls back to DuckDB's type sniffing if the files don't parse with the
+        types derived from the DDF schema.
+        """
+        typed_sql = " UNION ALL ".join(self._typed_read_sql(csv_file, columns) for csv_file in csv_files)
+        create_sql = f"CREATE OR REPLACE TABLE {table_name} AS ({typed_sql})"
+        logger.debug(f"executing {create_sql}")
+
+        try:
+            self.connection.execute(create_sql)
+        except duckdb.Error as e:
+            logger.warning(f"Typed read failed for {table_name}, falling back to type detection: {e}")
+            union_sql = " UNION ALL ".join(
+                f"SELECT * FROM read_csv_auto('{csv_file}', header=true, sample_size={sample_size})"
+                for csv_file in csv_files
+            )
+            self.connection.execute(f"CREATE OR REPLACE TABLE {table_name} AS ({union_sql})")
+
+    def _typed_read_sql(self, csv_file: Path, columns: List[str]) -> str:
+        """Build a query reading a CSV file with explicit column types, skipping sniffing."""
+        header = self._read_csv_header(csv_file)
+        column_types = ", ".join(f"'{column}': '{self._column_type(column)}'" for column in header)
+        select_list = ", ".join(f'"{column}"' for column in columns)
+        return (
+            f"SELECT {select_list} FROM read_csv('{csv_file}', header=true, auto_detect=false, "
+            f"delim=',', quote='\"', escape='\"', columns={{{column_types}}})"
+        )
+
+    def _read_csv_header(self, csv_file: Path) -> List[str]:
+        """Read the column names from the header line of a CSV file."""
+        with open(csv_file, newline='', encoding='utf-8-sig') as f:
+            return [column.strip() for column in next(csv.reader(f), [])]
+
+    def _column_type(self, column: str) -> str:
+        """Derive the column type of a concept, once per concept."""
+        if column not in self.column_types:
+            if column in self.schema_field_types:
+                column_type = self.SCHEMA_COLUMN_TYPES.get(self.schema_field_types[column], 'VARCHAR')
+            elif column.startswith('is--'):
+                column_type = 'BOOLEAN'
+            else:
+                concept_type = self.concepts.get(column, {}).get('concept_type', '')
+                column_type = self.CONCEPT_COLUMN_TYPES.get(concept_type, 'VARCHAR')
+            self.column_types[column] = column_type
+        return self.column_types[column]
+
     def _add_datapoint_table_comments(self, table_name: str, indicator: str, dimensions: List[str], columns: List[str]) -> None:
         """Add table and column comments for datapoint tables."""
         # Table comment
@@ -341,16 +762,285 @@ class GapminderToDuckDB:
                 except Exception as e:
                     logger.warning(f"Could not add comment to column {table_name}.{column}: {e}")
 
-    def _sanitize_table_name(self, name: str) -> str:
-        """Sanitize table name for SQL compatibility."""
-        # Replace problematic characters with underscores
-        sanitized = re.sub(r'[^a-zA-Z0-9_]', '_', name)
-        # replace double-underscore with single underscore
-        sanitized = re.sub(r'_+', '_', sanitized)
-        # Ensure it doesn't start with a number
-        if sanitized and sanitized[0].isdigit():
-            sanitized = f"t_{sanitized}"
-        return sanitized
+    def _is_geo_concept(self, concept: str) -> bool:
+        """Check whether a concept is the geo domain or one of its entity sets."""
+        return concept == 'geo' or self.concepts.get(concept, {}).get('domain') == 'geo'
+
+    def _is_time_concept(self, concept: str) -> bool:
+        """Check whether a concept holds time values."""
+        return concept == 'time' or self.concepts.get(concept, {}).get('concept_type') in ('time', 'year')
+
+    def create_geo_hierarchy(self) -> None:
+        """Create the geo closure table and regional aggregates built on it."""
+        logger.info("Creating geo hierarchy...")
+
+        try:
+            if self._create_geo_closure():
+                self._create_geo_aggregates()
+        except Exception as e:
+            logger.error(f"Error creating geo hierarchy: {e}")
+
+    def _create_geo_closure(self) -> bool:
+        """Materialize every geo with each ancestor region and grouping it belongs to.
+
+        Memberships come from the columns of geo entity tables that refer to
+        other geo entity sets, e.g. `world_4region` in the country table.
+        Countries additionally belong to the synthetic ancestor 'world'.
+        Returns False if the dataset has no geo memberships.
+        """
+        edges = []
+        countries = []
+        for entity_info in self.entities.values():
+            if 'table' not in entity_info or not self._is_geo_concept(entity_info['key']):
+                continue
+
+            table_name, key = entity_info['table'], entity_info['key']
+            for column in entity_info['columns']:
+                if column != key and self._is_geo_concept(column):
+                    edges.append(f"""
+                        SELECT "{key}"::VARCHAR AS geo, "{column}"::VARCHAR AS parent, '{column}' AS parent_set
+                        FROM {table_name}
+                        WHERE "{column}" IS NOT NULL AND "{column}" <> "{key}"
+                    """)
+
+            if key == 'country':
+                countries.append(f"SELECT country::VARCHAR AS geo FROM {table_name}")
+            elif 'is--country' in entity_info['columns']:
+                countries.append(f'SELECT "{key}"::VARCHAR AS geo FROM {table_name} WHERE "is--country"')
+
+        if not edges:
+            logger.info("No geo memberships found, skipping geo hierarchy")
+            return False
+
+        # Without country flags, the members that nothing belongs to are the countries
+        if not countries:
+            countries.append("SELECT geo FROM edges EXCEPT SELECT parent FROM edges")
+
+        self.connection.execute(f"""
+            CREATE OR REPLACE TABLE metadata_geo_closure AS
+            WITH RECURSIVE edges AS ({" UNION ".join(edges)}),
+            closure(geo, ancestor, ancestor_set, depth) AS (
+                SELECT geo, parent, parent_set, 1 FROM edges
+                UNION
+                SELECT c.geo, e.parent, e.parent_set, c.depth + 1
+                FROM closure c JOIN edges e ON e.geo = c.ancestor
+                WHERE c.depth < 16
+            ),
+            countries AS ({" UNION ".join(countries)})
+            SELECT geo, ancestor, ancestor_set, min(depth)::TINYINT AS depth
+            FROM closure
+            GROUP BY geo, ancestor, ancestor_set
+            UNION ALL
+            SELECT geo, 'world', 'world', NULL FROM countries
+            ORDER BY geo, ancestor_set, ancestor
+        """)
+        self.connection.execute("""
+            COMMENT ON TABLE metadata_geo_closure IS
+            'Geo hierarchy closure: every geo with each region and grouping it belongs to, directly or transitively. Countries also belong to the ancestor ''world'' of set ''world''.'
+        """)
+
+        count = self.connection.execute("SELECT COUNT(*) FROM metadata_geo_closure").fetchone()[0]
+        logger.info(f"Created geo closure table 'metadata_geo_closure' with {count} rows")
+        return True
+
+    def _create_geo_aggregates(self) -> None:
+        """Aggregate geo and time datapoints of every indicator to regions and the world."""
+        self.connection.execute("""
+            CREATE OR REPLACE TABLE metadata_geo_aggregates (
+                indicator VARCHAR, ancestor_set VARCHAR, ancestor VARCHAR, time SMALLINT,
+                geo_count INTEGER, value_sum DOUBLE, value_avg DOUBLE, value_min DOUBLE, value_max DOUBLE
+            )
+        """)
+
+        for table_name, (indicator, dimensions) in self.datapoint_tables.items():
+            if len(dimensions) != 2:
+                continue
+            geo_column = next((d for d in dimensions if self._is_geo_concept(d)), None)
+            time_column = next((d for d in dimensions if self._is_time_concept(d)), None)
+            if not geo_column or not time_column:
+                continue
+
+            try:
+                # Only countries are aggregated, so regional datapoints aren't counted twice
+                self.connection.execute(f"""
+                    INSERT INTO metadata_geo_aggregates
+                    SELECT '{indicator}', c.ancestor_set, c.ancestor, d."{time_column}",
+                           count(*), sum(d."{indicator}"), avg(d."{indicator}"),
+                           min(d."{indicator}"), max(d."{indicator}")
+                    FROM {table_name} d
+                    JOIN metadata_geo_closure c ON c.geo = d."{geo_column}"
+                    WHERE d."{indicator}" IS NOT NULL
+                      AND c.geo IN (SELECT geo FROM metadata_geo_closure WHERE ancestor_set = 'world')
+                    GROUP BY c.ancestor_set, c.ancestor, d."{time_column}"
+                """)
+            except Exception as e:
+                logger.warning(f"Could not aggregate {table_name} to regions: {e}")
+
+        # Sort by lookup key so reads of one indicator and region touch few row groups
+        self.connection.execute("""
+            CREATE OR REPLACE TABLE metadata_geo_aggregates AS
+            SELECT * FROM metadata_geo_aggregates
+            ORDER BY indicator, ancestor_set, ancestor, time
+        """)
+        self.connection.execute("""
+            COMMENT ON TABLE metadata_geo_aggregates IS
+            'Precomputed region and world aggregates of country datapoints per indicator and time, along metadata_geo_closure'
+        """)
+
+        count = self.connection.execute("SELECT COUNT(*) FROM metadata_geo_aggregates").fetchone()[0]
+        logger.info(f"Created geo aggregates table 'metadata_geo_aggregates' with {count} rows")
+
+    def create_indicator_stats(self) -> None:
+        """Compute value distributions per indicator and year for chart axes and color scales.
+
+        For every numeric datapoint table this stores count, min, max, mean,
+        approximate quantiles and an equal-width histogram, once per year and
+        once over all years (all_years). Times are stored as text, so values
+        that aren't years (2020q1) keep their own rows. Histogram bins span the
+        range over all years, so the histograms of different years are comparable.
+        """
+        logger.info("Computing indicator statistics...")
+
+        quantile_columns = [f"p{round(q * 100):02d}" for q in self.STATS_QUANTILES]
+        self.connection.execute(f"""
+            CREATE OR REPLACE TABLE metadata_indicator_stats (
+                indicator VARCHAR, table_name VARCHAR, time VARCHAR, all_years BOOLEAN,
+                count BIGINT, min DOUBLE, max DOUBLE, mean DOUBLE,
+                {', '.join(f'{column} DOUBLE' for column in quantile_columns)},
+                histogram_min DOUBLE, histogram_max DOUBLE, histogram BIGINT[]
+            )
+        """)
+
+        numeric_columns = self._numeric_columns()
+        bins = self.STATS_HISTOGRAM_BINS
+        histogram_sql = ", ".join(f"count(*) FILTER (WHERE bin = {i})" for i in range(bins))
+        quantile_sql = ", ".join(
+            f"quantiles[{i + 1}]" for i in range(len(self.STATS_QUANTILES))
+        )
+
+        for table_name, (indicator, dimensions) in self.datapoint_tables.items():
+            if (table_name, indicator) not in numeric_columns:
+                continue
+            time_column = next((d for d in dimensions if self._is_time_concept(d)), None)
+            time_sql = f'd."{time_column}"::VARCHAR' if time_column else "NULL::VARCHAR"
+            # Without a time dimension there is only the all-years row
+            if time_column:
+                stats_time_sql = "time, GROUPING(time) = 1 AS all_years"
+                group_sql = "GROUP BY GROUPING SETS ((time), ())"
+            else:
+                stats_time_sql = "NULL::VARCHAR AS time, true AS all_years"
+                group_sql = ""
+
+            try:
+                self.connection.execute(f"""
+                    INSERT INTO metadata_indicator_stats
+                    WITH bounds AS (
+                        SELECT min("{indicator}") AS lo, max("{indicator}") AS hi
+                        FROM {table_name}
+                    ),
+                    binned AS (
+                        SELECT {time_sql} AS time, d."{indicator}"::DOUBLE AS value, b.lo, b.hi,
+                               coalesce(least(floor((d."{indicator}" - b.lo) / nullif(b.hi - b.lo, 0) * {bins}),
+                                              {bins - 1}), 0)::INTEGER AS bin
+                        FROM {table_name} d, bounds b
+                        WHERE d."{indicator}" IS NOT NULL
+                    ),
+                    stats AS (
+                        SELECT {stats_time_sql}, count(*) AS count,
+                               min(value) AS min, max(value) AS max, avg(value) AS mean,
+                               approx_quantile(value, {self.STATS_QUANTILES}) AS quantiles,
+                               any_value(lo) AS lo, any_value(hi) AS hi,
+                               [{histogram_sql}] AS histogram
+                        FROM binned
+                        {group_sql}
+                    )
+                    SELECT '{indicator}', '{table_name}', time, all_years, count, min, max, mean,
+                           {quantile_sql}, lo, hi, histogram
+                    FROM stats
+                """)
+            except Exception as e:
+                logger.warning(f"Could not compute statistics for {table_name}: {e}")
+
+        # Sort by lookup key so reading the stats of one indicator touches few row groups
+        self.connection.execute("""
+            CREATE OR REPLACE TABLE metadata_indicator_stats AS
+            SELECT * FROM metadata_indicator_stats
+            ORDER BY indicator, table_name, all_years DESC, time
+        """)
+        self.connection.execute(f"""
+            COMMENT ON TABLE metadata_indicator_stats IS
+            'Value distribution per indicator and year (all_years: over all years): count, min, max, mean, approximate quantiles {", ".join(quantile_columns)} and a histogram of {bins} equal-width bins from histogram_min to histogram_max, shared by all years of an indicator'
+        """)
+
+        count = self.connection.execute("SELECT COUNT(*) FROM metadata_indicator_stats").fetchone()[0]
+        logger.info(f"Created indicator statistics table 'metadata_indicator_stats' with {count} rows")
+
+    def create_series_table(self) -> None:
+        """Pack every numeric geo and time series into one row per indicator and geo.
+
+        series_by_geo_time holds parallel time and value lists sorted by time,
+        and is sorted by indicator and geo, so fetching a whole series reads a
+        single row from a few row groups instead of scanning a datapoint table.
+        Tables with times that aren't numbers (2020q1) are skipped.
+        """
+        logger.info("Creating packed series table...")
+
+        self.connection.execute("""
+            CREATE OR REPLACE TABLE series_by_geo_time (
+                indicator VARCHAR, geo VARCHAR, time SMALLINT[], value DOUBLE[]
+            )
+        """)
+
+        numeric_columns = self._numeric_columns()
+        for table_name, (indicator, dimensions) in self.datapoint_tables.items():
+            if len(dimensions) != 2 or (table_name, indicator) not in numeric_columns:
+                continue
+            geo_column = next((d for d in dimensions if self._is_geo_concept(d)), None)
+            time_column = next((d for d in dimensions if self._is_time_concept(d)), None)
+            if not geo_column or not time_column:
+                continue
+            if (table_name, time_column) not in numeric_columns:
+                logger.warning(f"Not packing series of {table_name}: time column {time_column} is not numeric")
+                continue
+
+            try:
+                # Both lists share one ordering, so their elements stay parallel
+                self.connection.execute(f"""
+                    INSERT INTO series_by_geo_time
+                    SELECT '{indicator}', "{geo_column}"::VARCHAR,
+                           list(TRY_CAST("{time_column}" AS SMALLINT) ORDER BY "{time_column}", "{indicator}"),
+                           list("{indicator}"::DOUBLE ORDER BY "{time_column}", "{indicator}")
+                    FROM {table_name}
+                    WHERE "{indicator}" IS NOT NULL
+                    GROUP BY "{geo_column}"
+                """)
+            except Exception as e:
+                logger.warning(f"Could not pack series of {table_name}: {e}")
+
+        # Sort by lookup key so a series fetch touches one row group
+        self.connection.execute("""
+            CREATE OR REPLACE TABLE series_by_geo_time AS
+            SELECT * FROM series_by_geo_time
+            ORDER BY indicator, geo
+        """)
+        self.connection.execute("""
+            COMMENT ON TABLE series_by_geo_time IS
+            'Geo and time datapoints packed per indicator and geo: parallel lists of years and values, sorted by year. Sorted by indicator and geo.'
+        """)
+
+        count = self.connection.execute("SELECT COUNT(*) FROM series_by_geo_time").fetchone()[0]
+        logger.info(f"Created packed series table 'series_by_geo_time' with {count} rows")
+
+    def _numeric_columns(self) -> Set[Tuple[str, str]]:
+        """Return the (table, column) pairs of all numeric columns in the database."""
+        rows = self.connection.execute("""
+            SELECT table_name, column_name FROM duckdb_columns()
+            WHERE schema_name = 'main'
+              AND (data_type IN ('TINYINT', 'SMALLINT', 'INTEGER', 'BIGINT', 'HUGEINT',
+                                 'UTINYINT', 'USMALLINT', 'UINTEGER', 'UBIGINT', 'FLOAT', 'DOUBLE')
+                   OR data_type LIKE 'DECIMAL%')
+        """).fetchall()
+        return set(rows)
 
     def create_metadata_views(self) -> None:
         """Create helpful metadata views."""
@@ -378,49 +1068,95 @@ class GapminderToDuckDB:
                     'Metadata table containing all concept definitions from the original ddf--concepts.csv file'
                 """)
 
-            # View of all tables with their descriptions
-            tables_sql = """
-            CREATE OR REPLACE VIEW metadata_tables AS
-            SELECT
-                table_name,
-                CASE
-                    WHEN table_name LIKE 'entities_%' THEN 'Entity Table'
-                    WHEN table_name LIKE 'datapoints_%' THEN 'Datapoint Table'
-                    WHEN table_name LIKE 'metadata_%' THEN 'Metadata Table'
-                    ELSE 'Other'
-                END as table_type,
-                obj_description(oid) as description
-            FROM information_schema.tables t
-            LEFT JOIN (
-                SELECT oid, relname
-                FROM pg_class
-                WHERE relkind = 'r'
-            ) c ON t.table_name = c.relname
-            WHERE table_schema = 'main'
-            ORDER BY table_type, table_name
-            """
-
-            # For DuckDB, we need a simpler approach
-            self.connection.execute("""
-                CREATE OR REPLACE VIEW metadata_tables AS
-                SELECT
-                    table_name,
-                    CASE
-                        WHEN table_name LIKE 'entities_%' THEN 'Entity Table'
-                        WHEN table_name LIKE 'datapoints_%' THEN 'Datapoint Table'
-                        WHEN table_name LIKE 'metadata_%' THEN 'Metadata Table'
-                        ELSE 'Other'
-                    END as table_type
-                FROM information_schema.tables
-                WHERE table_schema = 'main'
-                ORDER BY table_type, table_name
-            """)
+            # Catalog of all tables, materialized so browsing it is a single small scan
+            self._create_tables_catalog()
 
             logger.info("Created metadata views")
 
         except Exception as e:
             logger.error(f"Error creating metadata views: {e}")
 
+    def _create_tables_catalog(self) -> None:
+        """Materialize metadata_tables: type, contents and statistics of every table."""
+        tables = self.connection.execute("""
+            SELECT t.table_name, coalesce(t.comment, ''), list(c.column_name ORDER BY c.column_index)
+            FROM duckdb_tables() t
+            JOIN duckdb_columns() c USING (database_name, schema_name, table_name)
+            WHERE t.schema_name = 'main' AND t.table_name <> 'metadata_tables'
+            GROUP BY ALL
+            ORDER BY t.table_name
+        """).fetchall()
+        entity_keys = {info['table']: info['key'] for info in self.entities.values() if 'table' in info}
+
+        catalog = []
+        for table_name, description, columns in tables:
+            indicator, dimensions = self.datapoint_tables.get(table_name, (None, []))
+            if table_name in entity_keys:
+                dimensions = [entity_keys[table_name]]
+            geo_column = next((d for d in dimensions if self._is_geo_concept(d)), None)
+            time_column = next((d for d in dimensions if self._is_time_concept(d)), None)
+
+            stats_sql = ["COUNT(*)"]
+            stats_sql.append(f'TRY_CAST(MIN("{time_column}") AS INTEGER)' if time_column else "NULL")
+            stats_sql.append(f'TRY_CAST(MAX("{time_column}") AS INTEGER)' if time_column else "NULL")
+            stats_sql.append(f'COUNT(DISTINCT "{geo_column}")' if geo_column else "NULL")
+            row_count, time_min, time_max, geo_count = self.connection.execute(
+                f"SELECT {', '.join(stats_sql)} FROM {table_name}"
+            ).fetchone()
+
+            catalog.append({
+                'table_name': table_name,
+                'table_type': self._table_type(table_name),
+                'indicator': indicator,
+                'dimensions': dimensions,
+                'columns': columns,
+                'row_count': row_count,
+                'time_min': time_min,
+                'time_max': time_max,
+                'geo_count': geo_count,
+                'description': description,
+            })
+
+        catalog.append({
+            'table_name': 'metadata_tables',
+            'table_type': self._table_type('metadata_tables'),
+            'indicator': None,
+            'dimensions': [],
+            'columns': ['table_name', 'table_type', 'indicator', 'dimensions', 'columns',
+                        'row_count', 'time_min', 'time_max', 'geo_count', 'description'],
+            'row_count': len(tables) + 1,
+            'time_min': None,
+            'time_max': None,
+            'geo_count': None,
+            'description': self.TABLES_CATALOG_DESCRIPTION,
+        })
+
+        catalog_df = pd.DataFrame(catalog)
+        self.connection.execute("""
+            CREATE OR REPLACE TABLE metadata_tables (
+                table_name VARCHAR, table_type VARCHAR, indicator VARCHAR,
+                dimensions VARCHAR[], columns VARCHAR[], row_count BIGINT,
+                time_min INTEGER, time_max INTEGER, geo_count INTEGER, description VARCHAR
+            )
+        """)
+        self.connection.execute("""
+            INSERT INTO metadata_tables
+            SELECT * FROM catalog_df ORDER BY table_type, table_name
+        """)
+        self.connection.execute(f"COMMENT ON TABLE metadata_tables IS '{self.TABLES_CATALOG_DESCRIPTION}'")
+
+    def _table_type(self, table_name: str) -> str:
+        """Classify a table by its name prefix."""
+        if table_name.startswith('entities_'):
+            return 'Entity Table'
+        if table_name.startswith('datapoints_'):
+            return 'Datapoint Table'
+        if table_name.startswith('metadata_'):
+            return 'Metadata Table'
+        if table_name.startswith('series_'):
+            return 'Series Table'
+        return 'Other'
+
     def create_indexes(self) -> None:
         """Create useful indexes for better query performance."""
         logger.info("Creating indexes...")
@@ -473,6 +1209,7 @@ class GapminderToDuckDB:
                                WHEN table_name LIKE 'entities_%' THEN 'Entity Tables'
                                WHEN table_name LIKE 'datapoints_%' THEN 'Datapoint Tables'
                                WHEN table_name LIKE 'metadata_%' THEN 'Metadata Tables'
+                               WHEN table_name LIKE 'series_%' THEN 'Series Tables'
                                ELSE 'Other Tables'
                            END as table_type
                     FROM information_schema.tables
@@ -504,7 +1241,7 @@ class GapminderToDuckDB:
             logger.info(f"  Total data rows: {total_rows:,}")
 
             # Database size (approximate)
-            db_size = self.output_db.stat().st_size / (1024 * 1024)  # MB
+            db_size = self.build_db.stat().st_size / (1024 * 1024)  # MB
             logger.info(f"  Database size: {db_size:.1f} MB")
 
         except Exception as e:
@@ -518,7 +1255,8 @@ class GapminderToDuckDB:
             # Step 1: Get the data
             self.clone_or_update_repo()
 
-            # Step 2: Connect to database
+            # Step 2: Open the build journal and connect to the database being built
+            self.open_journal()
             self.connect_db()
 
             # Step 3: Load metadata
@@ -533,26 +1271,50 @@ class GapminderToDuckDB:
             # Step 6: Create datapoint tables
             self.create_datapoint_tables()
 
-            # Step 7: Create metadata views
-            self.create_metadata_views()
+            # Phases completed by a previous run miss the tables built in this one
+            if self.tables_built:
+                self.journal.forget(self.DERIVED_STEPS)
+
+            # Step 7: Create geo hierarchy and regional aggregates
+            self._run_step('geo hierarchy', self.create_geo_hierarchy)
+
+            # Step 8: Compute indicator value distributions
+            self._run_step('indicator statistics', self.create_indicator_stats)
+
+            # Step 9: Pack series per indicator and geo (optional)
+            if self.series_layout:
+                self._run_step('series layout', self.create_series_table)
 
-            # Step 8: Create indexes (optional)
-            if self.create_indexes:
-                self.create_indexes()
+            # Step 10: Create metadata views
+            self._run_step('metadata views', self.create_metadata_views)
+
+            # Step 11: Create indexes (optional)
+            if self.with_indexes:
+                self._run_step('indexes', self.create_indexes)
             else:
                 logger.info("Skipping index creation (disabled by --no-indexes flag)")
 
-            # Step 9: Print summary
+            # Step 12: Print summary
             self.print_summary()
 
+            # Step 13: Move the complete database into place
+            self.connection.close()
+            self.connection = None
+            os.replace(self.build_db, self.output_db)
+            self.journal.remove()
+
             logger.info(f"Conversion completed successfully! Database saved to: {self.output_db}")
 
         except Exception as e:
             logger.error(f"Conversion failed: {e}")
+            if self.journal:
+                logger.info(f"Rerun to resume from {self.journal.path}")
             raise
         finally:
             if self.connection:
                 self.connection.close()
+            if self.journal:
+                self.journal.close()
 
 
 def main():
@@ -587,12 +1349,30 @@ Examples:
         help='DDF source repository'
     )
 
+    parser.add_argument(
+        '--offline',
+        action='store_true',
+        help='Use the repository at --repo-path as is, without cloning or pulling'
+    )
+
+    parser.add_argument(
+        '--restart',
+        action='store_true',
+        help='Ignore the journal of an interrupted build and start over (default: resume)'
+    )
+
     parser.add_argument(
         '--no-indexes',
         action='store_true',
         help='Skip creating indexes to save disk space (default: create indexes)'
     )
 
+    parser.add_argument(
+        '--series-layout',
+        action='store_true',
+        help='Also store geo and time series packed as one row per indicator and geo (series_by_geo_time)'
+    )
+
     parser.add_argument(
         '--verbose', '-v',
         action='store_true',
@@ -602,19 +1382,22 @@ Examples:
     args = parser.parse_args()
 
     # Check if required tools are available
-    try:
-        subprocess.run(['git', '--version'], capture_output=True, check=True)
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        logger.error("Git is required but not found. Please install Git.")
-        sys.exit(1)
+    if not args.offline:
+        try:
+            subprocess.run(['git', '--version'], capture_output=True, check=True)
+        except (subprocess.CalledProcessError, FileNotFoundError):
+            logger.error("Git is required but not found. Please install Git.")
+            sys.exit(1)
 
     # Run conversion
     converter = GapminderToDuckDB(
         repo_path=args.repo_path,
         output_db=args.output_db,
-        source_repo=args.source_repo,
+        source_repo=None if args.offline else args.source_repo,
         verbose=args.verbose,
-        create_indexes=not args.no_indexes  # Invert the flag
+        create_indexes=not args.no_indexes,  # Invert the flag
+        resume=not args.restart,
+        series_layout=args.series_layout
     )
 
     try:
@@ -0,0 +1,545 @@
+#!/usr/bin/env python3
+"""
+WorldSpecs Query Service
+
+This script serves a DuckDB database built by gapminder_to_duckdb.py over HTTP,
+for clients that want to run queries on a machine with more cores than a
+browser tab gets.
+
+The service:
+- Holds a pool of read-only DuckDB connections to the database, without
+  access to files or the network beyond the database itself
+- Only runs single SELECT statements (including WITH, DESCRIBE and the like)
+- Caches results keyed by normalized SQL
+- Streams results in the Arrow IPC stream format
+
+Browsers may only call it cross-origin from the origin given with --allow-origin.
+
+Endpoints:
+    POST /query   SQL in the request body
+    GET  /query   SQL in the `sql` query parameter
+    GET  /stats   Cache and pool statistics as JSON
+
+Usage:
+    python query_server.py [--db-path PATH] [--port PORT] [--connections N]
+    python query_server.py --benchmark ../static/sample-queries.json
+"""
+
+import sys
+import argparse
+import json
+import logging
+import queue
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+from urllib.request import Request, urlopen
+import duckdb
+import pyarrow as pa
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+ARROW_STREAM_MIME_TYPE = 'application/vnd.apache.arrow.stream'
+
+# String literals (escape, dollar-quoted and plain), quoted identifiers, comments and whitespace
+SQL_TOKEN_PATTERN = re.compile(
+    r"""(?P<literal>(?<![\w$])[eE]'(?:[^'\\]|\\.|'')*'"""
+    r"""|\$(?P<tag>(?:[A-Za-z_]\w*)?)\$.*?\$(?P=tag)\$"""
+    r"""|'(?:[^']|'')*')"""
+    r"""|(?P<identifier>"(?:[^"]|"")*")|(?P<comment>--[^\n]*|/\*.*?\*/)|(?P<space>\s+)""",
+    re.DOTALL
+)
+
+
+def normalize_sql(sql: str) -> str:
+    """Normalize SQL text for use as a cache key.
+
+    Comments are dropped, whitespace is collapsed and unquoted text is
+    lowercased. String literals, including escape and dollar-quoted strings,
+    and quoted identifiers are kept verbatim.
+    """
+    parts = []
+    position = 0
+    for match in SQL_TOKEN_PATTERN.finditer(sql):
+        parts.append(sql[position:match.start()].lower())
+        if match.group('literal') or match.group('identifier'):
+            parts.append(match.group(0))
+        elif parts and not parts[-1].endswith(' '):
+            # Runs of comments and whitespace become one space, literals keep theirs
+            parts.append(' ')
+        position = match.end()
+    parts.append(sql[position:].lower())
+
+    return ''.join(parts).strip().rstrip(';').strip()
+
+
+class ConnectionPool:
+    """Fixed-size pool of read-only connections to one DuckDB database."""
+
+    def __init__(self, db_path: str, size: int, threads: Optional[int] = None):
+        self.db_path = Path(db_path)
+        self.size = size
+        # Settings apply to the database instance, shared by all cursors. Clients may
+        # not read or write other files, or change settings.
+        config = {'enable_external_access': False, 'lock_configuration': True}
+        if threads:
+            config['threads'] = threads
+        self.database = duckdb.connect(str(self.db_path), read_only=True, config=config)
+        self.connections: queue.Queue = queue.Queue()
+
+        for _ in range(size):
+            # Cursors are separate connections sharing the same database instance
+            self.connections.put(self.database.cursor())
+
+    @contextmanager
+    def connection(self) -> Iterator[duckdb.DuckDBPyConnection]:
+        """Borrow a connection from the pool for the duration of the block."""
+        connection = self.connections.get()
+        try:
+            yield connection
+        finally:
+            self.connections.put(connection)
+
+    def close(self) -> None:
+        """Close all pooled connections and the database."""
+        while not self.connections.empty():
+            self.connections.get_nowait().close()
+        self.database.close()
+
+
+class ResultCache:
+    """Thread-safe LRU cache of serialized Arrow IPC results, bounded by size in bytes."""
+
+    def __init__(self, max_bytes: int, max_entry_bytes: int):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self.entries: 'OrderedDict[str, bytes]' = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the cached result for a key, or None on a miss."""
+        with self.lock:
+            result = self.entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def put(self, key: str, result: bytes) -> None:
+        """Cache a result, evicting the least recently used entries if needed."""
+        if len(result) > self.max_entry_bytes:
+            return
+
+        with self.lock:
+            if key in self.entries:
+                self.size -= len(self.entries.pop(key))
+            self.entries[key] = result
+            self.size += len(result)
+
+            while self.size > self.max_bytes:
+                _, evicted = self.entries.popitem(last=False)
+                self.size -= len(evicted)
+
+    def stats(self) -> Dict:
+        """Return cache statistics."""
+        with self.lock:
+            return {
+                'entries': len(self.entries),
+                'bytes': self.size,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+
+class CapturingWriter:
+    """File-like object forwarding writes to a stream while keeping a bounded copy."""
+
+    def __init__(self, stream, max_bytes: int):
+        self.stream = stream
+        self.max_bytes = max_bytes
+        self.chunks: List[bytes] = []
+        self.size = 0
+        self.overflowed = False
+        self.closed = False
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self.stream.write(data)
+        if not self.overflowed:
+            self.size += len(data)
+            if self.size > self.max_bytes:
+                self.overflowed = True
+                self.chunks = []
+            else:
+                self.chunks.append(data)
+        return len(data)
+
+    def flush(self) -> None:
+        self.stream.flush()
+
+    def captured(self) -> Optional[bytes]:
+        """Return everything written, or None if it exceeded the size bound."""
+        return None if self.overflowed else b''.join(self.chunks)
+
+
+class QueryService:
+    """Executes queries on pooled connections and caches their Arrow results."""
+
+    def __init__(self, db_path: str, connections: int = 4, threads: Optional[int] = None,
+                 cache_bytes: int = 256 * 1024 * 1024, max_entry_bytes: int = 32 * 1024 * 1024,
+                 batch_rows: int = 64 * 1024):
+        self.pool = ConnectionPool(db_path, connections, threads)
+        self.cache = ResultCache(cache_bytes, max_entry_bytes)
+        self.batch_rows = batch_rows
+
+    def execute(self, sql: str, open_stream: Callable[[], BinaryIO]) -> bool:
+        """Run a query and write its result as an Arrow IPC stream.
+
+        `open_stream` is only called once the query has started successfully,
+        so errors in the query surface before anything is written.
+        Returns True if the result was served from the cache.
+        Raises ValueError for anything but a single SELECT statement.
+        """
+        self._check_select(sql)
+        key = normalize_sql(sql)
+        cached = self.cache.get(key)
+        if cached is not None:
+            open_stream().write(cached)
+            return True
+
+        with self.pool.connection() as connection:
+            reader = self._arrow_reader(connection.execute(sql))
+            writer = CapturingWriter(open_stream(), self.cache.max_entry_bytes)
+            with pa.ipc.new_stream(writer, reader.schema) as ipc_writer:
+                for batch in reader:
+                    ipc_writer.write_batch(batch)
+
+        result = writer.captured()
+        if result is not None:
+            self.cache.put(key, result)
+        return False
+
+    @staticmethod
+    def _check_select(sql: str) -> None:
+        """Reject SQL that is not exactly one SELECT statement."""
+        statements = duckdb.extract_statements(sql)
+        if len(statements) != 1:
+            raise ValueError(f"Expected one SQL statement, got {len(statements)}")
+        if statements[0].type != duckdb.StatementType.SELECT:
+            raise ValueError(f"Only SELECT queries are allowed, got {statements[0].type.name}")
+
+    def _arrow_reader(self, result: duckdb.DuckDBPyConnection) -> pa.RecordBatchReader:
+        """Get a record batch reader over a query result."""
+        # to_arrow_reader replaces fetch_record_batch in newer DuckDB versions
+        if hasattr(result, 'to_arrow_reader'):
+            return result.to_arrow_reader(self.batch_rows)
+        return result.fetch_record_batch(self.batch_rows)
+
+    def stats(self) -> Dict:
+        """Return service statistics."""
+        return {
+            'database': str(self.pool.db_path),
+            'connections': self.pool.size,
+            'cache': self.cache.stats(),
+        }
+
+    def close(self) -> None:
+        """Release all database connections."""
+        self.pool.close()
+
+
+class QueryRequestHandler(BaseHTTPRequestHandler):
+    """HTTP handler exposing a QueryService."""
+
+    service: QueryService = None
+    allowed_origin: Optional[str] = None
+
+    def do_OPTIONS(self) -> None:
+        self.send_response(204)
+        self._send_cors_headers()
+        self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.end_headers()
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        if url.path == '/stats':
+            self._send_text(200, json.dumps(self.service.stats()), 'application/json')
+        elif url.path == '/query':
+            sql = parse_qs(url.query).get('sql', [''])[0]
+            self._run_query(sql)
+        else:
+            self._send_text(404, f"Unknown endpoint: {url.path}")
+
+    def do_POST(self) -> None:
+        url = urlparse(self.path)
+        if url.path != '/query':
+            self._send_text(404, f"Unknown endpoint: {url.path}")
+            return
+
+        length = int(self.headers.get('Content-Length', 0))
+        sql = self.rfile.read(length).decode('utf-8')
+        self._run_query(sql)
+
+    def _run_query(self, sql: str) -> None:
+        if not sql.strip():
+            self._send_text(400, "No SQL query given")
+            return
+
+        responded = False
+
+        def open_stream() -> BinaryIO:
+            nonlocal responded
+            responded = True
+            self.send_response(200)
+            self._send_cors_headers()
+            self.send_header('Content-Type', ARROW_STREAM_MIME_TYPE)
+            self.send_header('Connection', 'close')
+            self.end_headers()
+            return self.wfile
+
+        start = time.perf_counter()
+        try:
+            cached = self.service.execute(sql, open_stream)
+        except (duckdb.Error, ValueError, OSError) as e:
+            if not responded:
+                self._send_text(400, str(e))
+            else:
+                # Headers are already sent, the client sees a truncated stream
+                logger.error(f"Query failed while streaming: {e}")
+            return
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        logger.debug(f"{'cache hit' if cached else 'executed'} in {elapsed_ms:.1f} ms: {normalize_sql(sql)[:100]}")
+
+    def _send_text(self, status: int, text: str, content_type: str = 'text/plain') -> None:
+        body = text.encode('utf-8')
+        self.send_response(status)
+        self._send_cors_headers()
+        self.send_header('Content-Type', f"{content_type}; charset=utf-8")
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_cors_headers(self) -> None:
+        if self.allowed_origin:
+            self.send_header('Access-Control-Allow-Origin', self.allowed_origin)
+
+    def log_message(self, format: str, *args) -> None:
+        logger.debug(f"{self.address_string()} - {format % args}")
+
+
+def create_server(service: QueryService, host: str, port: int,
+                  allowed_origin: Optional[str] = None) -> ThreadingHTTPServer:
+    """Create an HTTP server answering queries with the given service.
+
+    Cross-origin browser requests are only allowed from `allowed_origin`.
+    """
+    handler = type('BoundQueryRequestHandler', (QueryRequestHandler,),
+                   {'service': service, 'allowed_origin': allowed_origin})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def load_sample_queries(queries_path: str) -> List[Tuple[str, str]]:
+    """Load (description, sql) pairs from a sample-queries.json file."""
+    with open(queries_path, encoding='utf-8') as f:
+        samples = json.load(f)
+
+    queries = []
+    for sample in samples:
+        sql = sample.get('sql_code', '')
+        if isinstance(sql, list):
+            sql = '\n'.join(sql)
+        if sql.strip():
+            queries.append((sample.get('description', sql[:40]), sql))
+    return queries
+
+
+def run_benchmark(service: QueryService, queries_path: str, rounds: int, concurrency: int) -> None:
+    """Benchmark the service over HTTP with the sample query workload.
+
+    The first round runs against an empty cache, later rounds are served
+    from the cache. Each round sends all queries with the given concurrency.
+    """
+    queries = load_sample_queries(queries_path)
+    server = create_server(service, '127.0.0.1', 0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/query"
+
+    def timed_request(sql: str) -> Tuple[float, Optional[int], Optional[str]]:
+        start = time.perf_counter()
+        try:
+            with urlopen(Request(url, data=sql.encode('utf-8'), method='POST')) as response:
+                table = pa.ipc.open_stream(response.read()).read_all()
+            return time.perf_counter() - start, table.num_rows, None
+        except Exception as e:
+            return time.perf_counter() - start, None, str(e)
+
+    logger.info(f"Benchmarking {len(queries)} queries, {rounds} rounds, concurrency {concurrency}")
+    latencies: Dict[str, List[float]] = {description: [] for description, _ in queries}
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for round_number in range(rounds):
+            round_start = time.perf_counter()
+            results = list(executor.map(timed_request, [sql for _, sql in queries]))
+            round_time = time.perf_counter() - round_start
+
+            for (description, _), (elapsed, rows, error) in zip(queries, results):
+                if error:
+                    logger.warning(f"  {description}: failed: {error}")
+                else:
+                    latencies[description].append(elapsed)
+
+            label = 'cold' if round_number == 0 else 'cached'
+            logger.info(f"Round {round_number + 1} ({label}): {round_time * 1000:.1f} ms, "
+                        f"{len(queries) / round_time:.1f} queries/s")
+
+    server.shutdown()
+
+    logger.info("Per-query latency (first round / median of cached rounds):")
+    for description, times in latencies.items():
+        if not times:
+            continue
+        cached_times = sorted(times[1:])
+        cached_ms = f"{cached_times[len(cached_times) // 2] * 1000:.1f} ms" if cached_times else "-"
+        logger.info(f"  {description}: {times[0] * 1000:.1f} ms / {cached_ms}")
+    logger.info(f"Cache: {service.cache.stats()}")
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Serve a WorldSpecs DuckDB database over HTTP with Arrow IPC results",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python query_server.py --db-path ../static/worldspecs.duckdb
+  curl --data 'SELECT * FROM metadata_concepts' localhost:8765/query > concepts.arrows
+  python query_server.py --benchmark ../static/sample-queries.json --rounds 10
+        """
+    )
+
+    parser.add_argument(
+        '--db-path',
+        default='../static/worldspecs.duckdb',
+        help='Path to the DuckDB database file (default: ../static/worldspecs.duckdb)'
+    )
+
+    parser.add_argument(
+        '--host',
+        default='127.0.0.1',
+        help='Address to listen on (default: 127.0.0.1)'
+    )
+
+    parser.add_argument(
+        '--port',
+        type=int,
+        default=8765,
+        help='Port to listen on (default: 8765)'
+    )
+
+    parser.add_argument(
+        '--allow-origin',
+        metavar='ORIGIN',
+        help='Origin allowed to query from a browser, e.g. http://localhost:5173 (default: none)'
+    )
+
+    parser.add_argument(
+        '--connections',
+        type=int,
+        default=4,
+        help='Number of pooled read-only connections (default: 4)'
+    )
+
+    parser.add_argument(
+        '--threads',
+        type=int,
+        help='DuckDB worker threads, shared by all connections (default: DuckDB default)'
+    )
+
+    parser.add_argument(
+        '--cache-mb',
+        type=int,
+        default=256,
+        help='Result cache size in MB (default: 256)'
+    )
+
+    parser.add_argument(
+        '--benchmark',
+        metavar='QUERIES_JSON',
+        help='Benchmark the service with a sample-queries.json workload instead of serving'
+    )
+
+    parser.add_argument(
+        '--rounds',
+        type=int,
+        default=5,
+        help='Benchmark rounds (default: 5)'
+    )
+
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=4,
+        help='Concurrent benchmark clients (default: 4)'
+    )
+
+    parser.add_argument(
+        '--verbose', '-v',
+        action='store_true',
+        help='Enable verbose logging'
+    )
+
+    args = parser.parse_args()
+
+    if args.verbose:
+        logger.setLevel(logging.DEBUG)
+
+    if not Path(args.db_path).exists():
+        logger.error(f"Database file not found: {args.db_path}")
+        sys.exit(1)
+
+    service = QueryService(
+        db_path=args.db_path,
+        connections=args.connections,
+        threads=args.threads,
+        cache_bytes=args.cache_mb * 1024 * 1024
+    )
+
+    try:
+        if args.benchmark:
+            run_benchmark(service, args.benchmark, args.rounds, args.concurrency)
+        else:
+            server = create_server(service, args.host, args.port, args.allow_origin)
+            logger.info(f"Serving {args.db_path} on http://{args.host}:{args.port}")
+            server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Query service stopped")
+    finally:
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Synthetic DDF Repository Generator
+
+This script writes a DDF-CSV repository with random data, shaped like the
+Gapminder datasets, for testing and benchmarking gapminder_to_duckdb.py at
+sizes no upstream repository has.
+
+The generated repository contains:
+- ddf--concepts.csv with geo, time, entity property and indicator concepts
+- Geo entities: countries, each belonging to one of the world 4 regions
+- One datapoint table per indicator, by country and time, optionally split
+  into several files with the same name in different directories (a union group)
+- A datapackage.json listing all resources (unless disabled)
+
+Usage:
+    python synthetic_ddf.py OUTPUT_DIR [--indicators N] [--entities N] [--rows N]
+"""
+
+import os
+import sys
+import argparse
+import csv
+import json
+import logging
+import math
+import random
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+REGIONS = ['africa', 'americas', 'asia', 'europe']
+FIRST_YEAR = 1800
+
+
+class SyntheticDDFGenerator:
+    """Writes a synthetic DDF repository of configurable size."""
+
+    def __init__(self, output_dir: str, concepts: int = 20, entities: int = 250,
+                 indicators: int = 500, files_per_group: int = 1, rows: int = 20000,
+                 missing: float = 0.1, datapackage: bool = True, seed: int = 42):
+        self.output_dir = Path(output_dir)
+        self.property_count = concepts
+        self.entity_count = entities
+        self.indicator_count = indicators
+        self.files_per_group = max(1, files_per_group)
+        self.rows = rows
+        self.missing = missing
+        self.datapackage = datapackage
+        self.random = random.Random(seed)
+
+        self.countries = [f"c{i:06d}" for i in range(entities)]
+        self.properties = [f"property_{i}" for i in range(concepts)]
+        self.indicators = [f"indicator_{i}" for i in range(indicators)]
+        self.resources: List[Dict] = []
+
+    def generate(self) -> Dict:
+        """Write the repository and return statistics about it."""
+        logger.info(f"Generating synthetic DDF repository in {self.output_dir}")
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+
+        self._write_concepts()
+        self._write_entities()
+        datapoint_rows = self._write_datapoints()
+        if self.datapackage:
+            self._write_datapackage()
+
+        size = sum(f.stat().st_size for f in self.output_dir.rglob('*') if f.is_file())
+        stats = {
+            'concepts': self.property_count,
+            'entities': self.entity_count,
+            'indicators': self.indicator_count,
+            'files_per_group': self.files_per_group,
+            'rows': datapoint_rows,
+            'input_mb': size / (1024 * 1024),
+        }
+        logger.info(f"Generated {self.indicator_count} indicators with {datapoint_rows:,} datapoints "
+                    f"({stats['input_mb']:.1f} MB)")
+        return stats
+
+    def _write_csv(self, relative_path: str, header: List[str], rows: Iterable, primary_key) -> int:
+        """Write a CSV file, register it as a datapackage resource and return its row count."""
+        path = self.output_dir / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        count = 0
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            for row in rows:
+                writer.writerow(row)
+                count += 1
+
+        self.resources.append({
+            'path': relative_path,
+            'name': relative_path.replace('/', '--').replace('.csv', ''),
+            'schema': {
+                'fields': [{'name': column} for column in header],
+                'primaryKey': primary_key,
+            },
+        })
+        return count
+
+    def _write_concepts(self) -> None:
+        concepts = [
+            ('geo', 'entity_domain', 'Geographic location', '', ''),
+            ('country', 'entity_set', 'Country', 'geo', ''),
+            ('world_4region', 'entity_set', 'World 4 region', 'geo', ''),
+            ('time', 'time', 'Time', '', ''),
+            ('name', 'string', 'Name', '', ''),
+            ('domain', 'string', 'Domain', '', ''),
+            ('concept_type', 'string', 'Concept type', '', ''),
+            ('unit', 'string', 'Unit', '', ''),
+        ]
+        concepts += [(prop, 'string', prop.replace('_', ' ').title(), '', '') for prop in self.properties]
+        concepts += [(indicator, 'measure', indicator.replace('_', ' ').title(), '', 'units')
+                     for indicator in self.indicators]
+
+        self._write_csv('ddf--concepts.csv', ['concept', 'concept_type', 'name', 'domain', 'unit'],
+                        concepts, 'concept')
+
+    def _write_entities(self) -> None:
+        self._write_csv(
+            'ddf--entities--geo--world_4region.csv',
+            ['world_4region', 'name', 'is--world_4region'],
+            [(region, region.title(), 'TRUE') for region in REGIONS],
+            'world_4region'
+        )
+
+        rows = (
+            [country, country.upper(), REGIONS[i % len(REGIONS)], 'TRUE']
+            + [f"{prop}-{self.random.randrange(100)}" for prop in self.properties]
+            for i, country in enumerate(self.countries)
+        )
+        self._write_csv(
+            'ddf--entities--geo--country.csv',
+            ['country', 'name', 'world_4region', 'is--country'] + self.properties,
+            rows,
+            'country'
+        )
+
+    def _write_datapoints(self) -> int:
+        """Write all datapoint files, returning the number of rows written."""
+        years = max(1, math.ceil(self.rows / max(1, self.entity_count)))
+        # Countries are split evenly across the files of a union group
+        parts = [self.countries[i::self.files_per_group] for i in range(self.files_per_group)]
+        total_rows = 0
+
+        for indicator in self.indicators:
+            scale = 10 ** self.random.randrange(0, 9)
+            filename = f"ddf--datapoints--{indicator}--by--country--time.csv"
+
+            for part_number, countries in enumerate(parts):
+                directory = 'datapoints' if self.files_per_group == 1 else f"datapoints-{part_number}"
+                rows = (
+                    (country, FIRST_YEAR + year, round(self.random.random() * scale, 3))
+                    for country in countries
+                    for year in range(years)
+                    if self.random.random() >= self.missing
+                )
+                total_rows += self._write_csv(f"{directory}/{filename}", ['country', 'time', indicator],
+                                              rows, ['country', 'time'])
+
+        return total_rows
+
+    def _write_datapackage(self) -> None:
+        datapackage = {
+            'name': 'synthetic-ddf',
+            'title': 'Synthetic DDF dataset',
+            'resources': self.resources,
+        }
+        with open(self.output_dir / 'datapackage.json', 'w', encoding='utf-8') as f:
+            json.dump(datapackage, f, indent=2)
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Generate a synthetic DDF-CSV repository",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python synthetic_ddf.py ./ddf--synthetic
+  python synthetic_ddf.py ./ddf--synthetic --indicators 5000 --files-per-group 4
+        """
+    )
+
+    parser.add_argument('output_dir', help='Directory to write the repository to')
+    parser.add_argument('--concepts', type=int, default=20,
+                        help='Number of additional entity property concepts (default: 20)')
+    parser.add_argument('--entities', type=int, default=250,
+                        help='Number of country entities (default: 250)')
+    parser.add_argument('--indicators', type=int, default=500,
+                        help='Number of indicators, one datapoint table each (default: 500)')
+    parser.add_argument('--files-per-group', type=int, default=1,
+                        help='Number of files each indicator is split into (default: 1)')
+    parser.add_argument('--rows', type=int, default=20000,
+                        help='Datapoint rows per indicator before removing missing values (default: 20000)')
+    parser.add_argument('--missing', type=float, default=0.1,
+                        help='Fraction of missing datapoints (default: 0.1)')
+    parser.add_argument('--no-datapackage', action='store_true',
+                        help='Do not write datapackage.json')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed (default: 42)')
+
+    args = parser.parse_args()
+
+    if os.path.exists(args.output_dir) and os.listdir(args.output_dir):
+        logger.error(f"Output directory is not empty: {args.output_dir}")
+        sys.exit(1)
+
+    SyntheticDDFGenerator(
+        output_dir=args.output_dir,
+        concepts=args.concepts,
+        entities=args.entities,
+        indicators=args.indicators,
+        files_per_group=args.files_per_group,
+        rows=args.rows,
+        missing=args.missing,
+        datapackage=not args.no_datapackage,
+        seed=args.seed
+    ).generate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+"""
+WorldSpecs Python Read API
+
+This module reads the DuckDB database built by gapminder_to_duckdb.py without
+looking up `datapoints_*` table names by hand.
+
+It provides:
+- A catalog of indicators and entity tables, loaded lazily on first use from
+  `metadata_concepts` and `metadata_tables` (or the table comments in databases
+  without it)
+- Indicator series with geo and time filters pushed down into the table scan
+- Results as Arrow tables, which polars reads without copying
+  (`polars.from_arrow(table)`) and pandas converts cheaply (`table.to_pandas()`)
+
+Usage:
+    from worldspecs import WorldSpecs
+
+    with WorldSpecs('gapminder.duckdb') as ws:
+        print(ws.indicators['pop'])
+        table = ws.series('pop', geo=['usa', 'chn'], time=(2000, 2020))
+        df = table.to_pandas()
+"""
+
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+import duckdb
+import pyarrow as pa
+
+from ddf_names import sanitize_name
+
+TimeFilter = Union[int, Tuple[Optional[int], Optional[int]]]
+
+
+class Concept(NamedTuple):
+    """A concept definition from metadata_concepts."""
+    concept: str
+    name: str
+    concept_type: str
+    description: str
+    unit: str
+    domain: str
+
+
+class IndicatorTable(NamedTuple):
+    """A datapoint table holding one indicator broken down by some dimensions."""
+    indicator: str
+    table_name: str
+    dimensions: Tuple[str, ...]
+    description: str
+    concept: Optional[Concept]
+
+
+class EntityTable(NamedTuple):
+    """An entity table with its key column."""
+    entity_type: str
+    table_name: str
+    key: str
+    columns: Tuple[str, ...]
+    description: str
+
+
+class Catalog:
+    """Indicators and entity tables available in a WorldSpecs database."""
+
+    def __init__(self, connection: duckdb.DuckDBPyConnection):
+        self.concepts: Dict[str, Concept] = {}
+        self.indicators: Dict[str, List[IndicatorTable]] = {}
+        self.entities: Dict[str, EntityTable] = {}
+
+        self._load_concepts(connection)
+        self._load_tables(connection)
+
+    def _load_concepts(self, connection: duckdb.DuckDBPyConnection) -> None:
+        """Load concept definitions, if the metadata table exists."""
+        try:
+            rows = connection.execute("""
+                SELECT concept, name, concept_type, description, unit, domain
+                FROM metadata_concepts
+            """).fetchall()
+        except duckdb.CatalogException:
+            return
+
+        for row in rows:
+            concept = Concept(*[self._clean(value) for value in row])
+            self.concepts[concept.concept] = concept
+
+    def _load_tables(self, connection: duckdb.DuckDBPyConnection) -> None:
+        """Build catalog entries from the metadata_tables catalog, if the database has one."""
+        try:
+            tables = connection.execute("""
+                SELECT table_name, coalesce(description, ''), columns, indicator, dimensions
+                FROM metadata_tables
+                WHERE table_type IN ('Datapoint Table', 'Entity Table')
+                ORDER BY table_name
+            """).fetchall()
+        except (duckdb.CatalogException, duckdb.BinderException):
+            # Databases built before metadata_tables was a table have a view without these columns
+            self._load_tables_from_schema(connection)
+            return
+
+        for table_name, description, columns, indicator, dimensions in tables:
+            if indicator is not None:
+                entry = IndicatorTable(indicator, table_name, tuple(dimensions), description,
+                                       self.concepts.get(indicator))
+                self.indicators.setdefault(indicator, []).append(entry)
+            elif table_name.startswith('entities_'):
+                entity_type = table_name[len('entities_'):]
+                key = dimensions[0] if dimensions else columns[0]
+                self.entities[entity_type] = EntityTable(entity_type, table_name, key, tuple(columns), description)
+            else:
+                self._add_indicator_table(table_name, description, columns)
+
+    def _load_tables_from_schema(self, connection: duckdb.DuckDBPyConnection) -> None:
+        """Build catalog entries from table names, columns and comments."""
+        tables = connection.execute("""
+            SELECT t.table_name, coalesce(t.comment, ''),
+                   list(c.column_name ORDER BY c.column_index)
+            FROM duckdb_tables() t
+            JOIN duckdb_columns() c USING (database_name, schema_name, table_name)
+            WHERE t.schema_name = 'main'
+              AND (t.table_name LIKE 'datapoints_%' OR t.table_name LIKE 'entities_%')
+            GROUP BY ALL
+            ORDER BY t.table_name
+        """).fetchall()
+
+        for table_name, description, columns in tables:
+            if table_name.startswith('datapoints_'):
+                self._add_indicator_table(table_name, description, columns)
+            else:
+                entity_type = table_name[len('entities_'):]
+                self.entities[entity_type] = EntityTable(
+                    entity_type, table_name, columns[0], tuple(columns), description
+                )
+
+    def _add_indicator_table(self, table_name: str, description: str, columns: List[str]) -> None:
+        """Register a datapoint table under the indicator it holds."""
+        # Table names are datapoints_<indicator>_by_<dimensions>, sanitized
+        indicator = next(
+            (column for column in columns
+             if table_name.startswith(f"datapoints_{sanitize_name(column)}_by_")),
+            columns[-1]
+        )
+        dimensions = tuple(column for column in columns if column != indicator)
+        entry = IndicatorTable(indicator, table_name, dimensions, description, self.concepts.get(indicator))
+        self.indicators.setdefault(indicator, []).append(entry)
+
+    def indicator(self, indicator: str, by: Optional[Sequence[str]] = None) -> IndicatorTable:
+        """Find the table of an indicator, optionally broken down by the given dimensions."""
+        tables = self.indicators.get(indicator)
+        if not tables:
+            raise KeyError(f"Unknown indicator: {indicator}")
+
+        if by is not None:
+            tables = [table for table in tables if set(table.dimensions) == set(by)]
+            if not tables:
+                raise KeyError(f"Indicator {indicator} is not broken down by {', '.join(by)}")
+
+        if len(tables) > 1:
+            options = '; '.join(', '.join(table.dimensions) for table in tables)
+            raise ValueError(f"Indicator {indicator} has several breakdowns, pick one with by=: {options}")
+
+        return tables[0]
+
+    def geo_dimension(self, table: IndicatorTable) -> Optional[str]:
+        """Return the dimension of a table holding geographic entities."""
+        for dimension in table.dimensions:
+            concept = self.concepts.get(dimension)
+            if dimension == 'geo' or (concept and 'geo' in (concept.concept, concept.domain)):
+                return dimension
+        return None
+
+    def time_dimension(self, table: IndicatorTable) -> Optional[str]:
+        """Return the dimension of a table holding time."""
+        for dimension in table.dimensions:
+            concept = self.concepts.get(dimension)
+            if dimension == 'time' or (concept and concept.concept_type in ('time', 'year')):
+                return dimension
+        return None
+
+    @staticmethod
+    def _clean(value) -> str:
+        """Normalize missing metadata values, which the converter stores as 'nan'."""
+        return '' if value is None or value == 'nan' else str(value)
+
+
+class WorldSpecs:
+    """Read access to a WorldSpecs DuckDB database."""
+
+    def __init__(self, db_path: str, threads: Optional[int] = None):
+        self.db_path = Path(db_path)
+        self.connection = duckdb.connect(str(self.db_path), read_only=True)
+        if threads:
+            self.connection.execute(f"SET threads={threads};")
+        self._catalog: Optional[Catalog] = None
+
+    @property
+    def catalog(self) -> Catalog:
+        """The catalog, loaded on first access."""
+        if self._catalog is None:
+            self._catalog = Catalog(self.connection)
+        return self._catalog
+
+    @property
+    def indicators(self) -> Dict[str, List[IndicatorTable]]:
+        """All indicators by concept name."""
+        return self.catalog.indicators
+
+    @property
+    def entities(self) -> Dict[str, EntityTable]:
+        """All entity tables by entity type."""
+        return self.catalog.entities
+
+    def series(self, indicator: str, geo: Union[str, Sequence[str], None] = None,
+               time: Optional[TimeFilter] = None, by: Optional[Sequence[str]] = None) -> pa.Table:
+        """Fetch datapoints of an indicator as an Arrow table.
+
+        `geo` restricts the geographic dimension to one or more entities,
+        `time` to one year or an inclusive (start, end) range where either
+        bound may be None. Both filters are pushed down into the table scan.
+        """
+        table = self.catalog.indicator(indicator, by)
+        conditions = []
+        params: List = []
+
+        if geo is not None:
+            geo_column = self.catalog.geo_dimension(table)
+            if geo_column is None:
+                raise ValueError(f"Table {table.table_name} has no geographic dimension")
+            geos = [geo] if isinstance(geo, str) else list(geo)
+            conditions.append(f'"{geo_column}" IN ({", ".join("?" for _ in geos)})')
+            params.extend(geos)
+
+        if time is not None:
+            time_column = self.catalog.time_dimension(table)
+            if time_column is None:
+                raise ValueError(f"Table {table.table_name} has no time dimension")
+            start, end = (time, time) if isinstance(time, int) else time
+            if start is not None:
+                conditions.append(f'"{time_column}" >= ?')
+                params.append(start)
+            if end is not None:
+                conditions.append(f'"{time_column}" <= ?')
+                params.append(end)
+
+        sql = f"SELECT * FROM {table.table_name}"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY " + ", ".join(f'"{dimension}"' for dimension in table.dimensions)
+
+        return self.query(sql, params)
+
+    def entity(self, entity_type: str, columns: Optional[Sequence[str]] = None) -> pa.Table:
+        """Fetch an entity table as an Arrow table, optionally only some columns."""
+        if entity_type not in self.entities:
+            raise KeyError(f"Unknown entity type: {entity_type}")
+
+        table = self.entities[entity_type]
+        select_list = ", ".join(f'"{column}"' for column in columns) if columns else "*"
+        return self.query(f"SELECT {select_list} FROM {table.table_name}")
+
+    def query(self, sql: str, params: Optional[Sequence] = None) -> pa.Table:
+        """Run a SQL query and return its result as an Arrow table."""
+        result = self.connection.execute(sql, params or [])
+        # to_arrow_table replaces fetch_arrow_table in newer DuckDB versions
+        if hasattr(result, 'to_arrow_table'):
+            return result.to_arrow_table()
+        return result.fetch_arrow_table()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self.connection.close()
+
+    def __enter__(self) -> 'WorldSpecs':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
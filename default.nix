@@ -15,6 +15,7 @@ stdenv.mkDerivation {
     python313 # data converter
     python313Packages.duckdb
     python313Packages.pandas
+    python313Packages.pyarrow
   ];
 
   nativeBuildInputs = [